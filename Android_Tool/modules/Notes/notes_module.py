@@ -6,19 +6,19 @@ Port từ index.html và Mainold.pyw
 import os
 import sys
 import sqlite3
-import uuid
+import functools
+import secrets
 from datetime import datetime, timezone
 
-from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QUrl, QRect, QPoint
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QUrl, QRect, QPoint, QObject, QRunnable, QThreadPool
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit,
     QTextEdit, QTableWidget, QTableWidgetItem, QHeaderView,
     QLabel, QMessageBox, QCheckBox, QDateTimeEdit, QComboBox,
     QSplitter, QFrame, QMenu, QColorDialog, QInputDialog, QStyle, QStyledItemDelegate
 )
-from PyQt6.QtGui import QFont, QColor, QFocusEvent, QAction, QTextCursor, QTextCharFormat, QDesktopServices, QPainter, QPen
+from PyQt6.QtGui import QFont, QColor, QBrush, QFocusEvent, QAction, QTextCursor, QTextCharFormat, QDesktopServices, QPainter, QPen
 from PyQt6.QtCore import QDateTime
-import re
 
 # Configuration
 tool_dir = os.path.dirname(os.path.abspath(__file__))
@@ -27,71 +27,174 @@ os.makedirs(data_dir, exist_ok=True)
 
 DATABASE_PATH = os.path.join(data_dir, "notes.db")
 
+# Item data role carrying the relative modified time rendered by NoteTitleDelegate
+NOTE_TIME_ROLE = Qt.ItemDataRole.UserRole
+# Item data role caching the note's is_marked flag (read by the context menu)
+NOTE_MARKED_ROLE = Qt.ItemDataRole.UserRole + 1
+
+# SQL statements - kept as module constants so sqlite3's statement cache always hits
+_SQL_CREATE_TABLE = """
+    CREATE TABLE IF NOT EXISTS notes (
+        id TEXT PRIMARY KEY,  -- opaque 32-char hex (older rows may hold dashed UUIDs)
+        title TEXT NOT NULL,
+        content TEXT,
+        due_time TEXT,
+        status TEXT DEFAULT 'none',
+        is_marked INTEGER DEFAULT 0,
+        created_at TEXT NOT NULL,
+        modified_at TEXT NOT NULL
+    )
+"""
+_SQL_INSERT = """
+    INSERT INTO notes (id, title, content, due_time, status, created_at, modified_at)
+    VALUES (?, ?, ?, NULL, 'none', ?, ?)
+"""
+_SQL_UPDATE = "UPDATE notes SET title = ?, content = ?, modified_at = ? WHERE id = ?"
+_SQL_UPDATE_TITLE = "UPDATE notes SET title = ?, modified_at = ? WHERE id = ?"
+_SQL_UPDATE_CONTENT = "UPDATE notes SET content = ?, modified_at = ? WHERE id = ?"
+_SQL_DELETE = "DELETE FROM notes WHERE id = ?"
+_SQL_TOGGLE_MARK = "UPDATE notes SET is_marked = NOT is_marked WHERE id = ?"
+_SQL_GET_ONE = "SELECT * FROM notes WHERE id = ?"
+_SQL_LIST_ALL = "SELECT * FROM notes ORDER BY modified_at DESC"
+_SQL_LIST_SEARCH = "SELECT * FROM notes WHERE (title LIKE ? OR content LIKE ?) ORDER BY modified_at DESC"
+_SQL_LIST_MARKED = "SELECT * FROM notes WHERE is_marked = 1 ORDER BY modified_at DESC"
+_SQL_LIST_SEARCH_MARKED = (
+    "SELECT * FROM notes WHERE (title LIKE ? OR content LIKE ?) AND is_marked = 1 "
+    "ORDER BY modified_at DESC"
+)
+_SQL_LIST_FAST_ALL = "SELECT id, title, modified_at, is_marked FROM notes ORDER BY modified_at DESC"
+_SQL_LIST_FAST_SEARCH = (
+    "SELECT id, title, modified_at, is_marked FROM notes WHERE (title LIKE ? OR content LIKE ?) "
+    "ORDER BY modified_at DESC"
+)
+_SQL_LIST_FAST_MARKED = (
+    "SELECT id, title, modified_at, is_marked FROM notes WHERE is_marked = 1 ORDER BY modified_at DESC"
+)
+_SQL_LIST_FAST_SEARCH_MARKED = (
+    "SELECT id, title, modified_at, is_marked FROM notes WHERE (title LIKE ? OR content LIKE ?) "
+    "AND is_marked = 1 ORDER BY modified_at DESC"
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_iso_time(iso_time_str):
+    """Parse a stored ISO timestamp (written with +00:00 by isoformat) - memoized per string."""
+    return datetime.fromisoformat(iso_time_str)
+
+
+def _relative_time(iso_time_str, now):
+    """Convert ISO timestamp to relative time string (now is computed once per load)."""
+    try:
+        seconds = int((now - _parse_iso_time(iso_time_str)).total_seconds())
+        
+        if seconds < 60:
+            return f"{seconds} giây trước"
+        elif seconds < 3600:
+            minutes = seconds // 60
+            return f"{minutes} phút trước"
+        elif seconds < 86400:
+            hours = seconds // 3600
+            return f"{hours} giờ trước"
+        elif seconds < 604800:
+            days = seconds // 86400
+            return f"{days} ngày trước"
+        elif seconds < 2592000:
+            weeks = seconds // 604800
+            return f"{weeks} tuần trước"
+        else:
+            months = seconds // 2592000
+            return f"{months} tháng trước"
+    except:
+        return ""
+
+
+class _LoadNotesSignals(QObject):
+    """Signal bridge for _LoadNotesTask (QRunnable is not a QObject)."""
+    finished = pyqtSignal(int, list, str, bool)
+
+
+class _LoadNotesTask(QRunnable):
+    """Query notes and build the table payload off the GUI thread."""
+    
+    def __init__(self, db, signals, request_id, search_query, log_search):
+        super().__init__()
+        self.db = db
+        self.signals = signals
+        self.request_id = request_id
+        self.search_query = search_query
+        self.log_search = log_search
+    
+    def run(self):
+        # sqlite3 connections are per-thread, so the task opens its own
+        conn = self.db.get_connection()
+        try:
+            notes = self.db.get_all_notes_fast(self.search_query, False, conn=conn)
+        finally:
+            conn.close()
+        
+        now = datetime.now(timezone.utc)
+        rows = [
+            (note_id, title, _relative_time(modified_at, now), is_marked == 1)
+            for note_id, title, modified_at, is_marked in notes
+        ]
+        self.signals.finished.emit(self.request_id, rows, self.search_query, self.log_search)
+
 
 class NoteTitleDelegate(QStyledItemDelegate):
     """Custom delegate to render title on left and time on right in the same cell."""
     
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Paint resources built once, reused for every row on every repaint
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+        self._time_font = QFont()
+        self._time_font.setBold(False)
+        self._title_color = QColor("#ffffff")
+        self._time_pen = QPen(QColor("#888888"))
+        self._sel_pen = QPen(QColor("#00aaff"))
+        self._sel_pen.setWidth(2)
+        self._glow_pen = QPen(QColor("#00aaff"))
+        self._glow_pen.setWidth(1)
+    
     def paint(self, painter, option, index):
         """Override paint to draw title and time separately."""
-        # Get the full text (title|||time format)
-        full_text = index.data(Qt.ItemDataRole.DisplayRole)
-        if not full_text:
+        # Title is the display text, relative time is stored under NOTE_TIME_ROLE
+        title = index.data(Qt.ItemDataRole.DisplayRole)
+        if not title:
             return
-        
-        # Split title and time
-        parts = full_text.split("|||")
-        title = parts[0] if len(parts) > 0 else ""
-        time_str = parts[1] if len(parts) > 1 else ""
+        time_str = index.data(NOTE_TIME_ROLE)
         
         # Get font and color from index data
-        font_data = index.data(Qt.ItemDataRole.FontRole)
-        color_data = index.data(Qt.ItemDataRole.ForegroundRole)
-        
-        if font_data:
-            font = font_data
-        else:
-            font = QFont()
-            font.setBold(True)
-        
-        if color_data:
-            color = color_data
-        else:
-            color = QColor("#ffffff")
+        font = index.data(Qt.ItemDataRole.FontRole) or self._bold_font
+        color = index.data(Qt.ItemDataRole.ForegroundRole) or self._title_color
+        if isinstance(color, QBrush):
+            color = color.color()
         
+        rect = option.rect
         painter.save()
         
         # Draw xeon border if selected (NO background fill)
         if option.state & QStyle.StateFlag.State_Selected:
-            # Draw glowing xeon blue border
-            pen = QPen(QColor("#00aaff"))
-            pen.setWidth(2)
-            painter.setPen(pen)
-            # Draw border with small inset
-            border_rect = option.rect.adjusted(1, 1, -1, -1)
-            painter.drawRect(border_rect)
+            # Draw glowing xeon blue border with small inset
+            painter.setPen(self._sel_pen)
+            painter.drawRect(rect.adjusted(1, 1, -1, -1))
             
-            # Optional: Draw inner glow effect
-            pen.setWidth(1)
-            pen.setColor(QColor("#00aaff"))
-            painter.setPen(pen)
-            inner_rect = option.rect.adjusted(2, 2, -2, -2)
-            painter.drawRect(inner_rect)
+            # Inner glow effect
+            painter.setPen(self._glow_pen)
+            painter.drawRect(rect.adjusted(2, 2, -2, -2))
         
         # Draw title on left (bold)
         painter.setFont(font)
         painter.setPen(color)
-        title_rect = QRect(option.rect.left() + 8, option.rect.top(), 
-                          option.rect.width() - 150, option.rect.height())
+        title_rect = QRect(rect.left() + 8, rect.top(), rect.width() - 150, rect.height())
         painter.drawText(title_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, title)
         
         # Draw time on right (gray, not bold)
         if time_str:
-            time_font = QFont(font)
-            time_font.setBold(False)
-            painter.setFont(time_font)
-            painter.setPen(QColor("#888888"))
-            time_rect = QRect(option.rect.right() - 140, option.rect.top(),
-                            130, option.rect.height())
+            painter.setFont(self._time_font)
+            painter.setPen(self._time_pen)
+            time_rect = QRect(rect.right() - 140, rect.top(), 130, rect.height())
             painter.drawText(time_rect, Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter, time_str)
         
         painter.restore()
@@ -116,6 +219,7 @@ class AutoSaveTextEdit(QTextEdit):
         self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.customContextMenuRequested.connect(self.show_custom_context_menu)
         self.setAcceptRichText(True)  # Enable rich text
+        self.document().setModified(False)  # Dirty bit for cheap change detection
         
     def focusOutEvent(self, event: QFocusEvent):
         """Emit signal when focus is lost."""
@@ -225,111 +329,105 @@ class NotesDatabase:
     
     def __init__(self, db_path):
         self.db_path = db_path
+        self.conn = self.get_connection()
         self.init_database()
     
     def get_connection(self):
-        """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
+        """Get database connection (statement cache sized for all hot queries)."""
+        conn = sqlite3.connect(self.db_path, cached_statements=256)
         conn.row_factory = sqlite3.Row
         return conn
     
     def init_database(self):
         """Initialize database schema."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        # Create notes table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS notes (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                content TEXT,
-                due_time TEXT,
-                status TEXT DEFAULT 'none',
-                is_marked INTEGER DEFAULT 0,
-                created_at TEXT NOT NULL,
-                modified_at TEXT NOT NULL
-            )
-        """)
-        
-        conn.commit()
-        conn.close()
+        with self.conn:
+            self.conn.execute(_SQL_CREATE_TABLE)
     
     def add_note(self, title, content=""):
         """Add new note."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         now = datetime.now(timezone.utc).isoformat()
-        note_id = str(uuid.uuid4())
-        
-        cursor.execute("""
-            INSERT INTO notes (id, title, content, due_time, status, created_at, modified_at)
-            VALUES (?, ?, ?, NULL, 'none', ?, ?)
-        """, (note_id, title, content, now, now))
+        note_id = secrets.token_hex(16)
         
-        conn.commit()
-        conn.close()
+        with self.conn:
+            self.conn.execute(_SQL_INSERT, (note_id, title, content, now, now))
         return note_id
     
+    def add_notes(self, items):
+        """Bulk add notes from (title, content) pairs in one transaction. Returns new IDs."""
+        now = datetime.now(timezone.utc).isoformat()
+        rows = [(secrets.token_hex(16), title, content, now, now) for title, content in items]
+        
+        with self.conn:
+            self.conn.executemany(_SQL_INSERT, rows)
+        return [row[0] for row in rows]
+    
     def update_note(self, note_id, title, content=""):
         """Update existing note."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        now = datetime.now(timezone.utc).isoformat()
         
+        with self.conn:
+            cursor = self.conn.execute(_SQL_UPDATE, (title, content, now, note_id))
+        return cursor.rowcount > 0
+    
+    def update_title(self, note_id, title):
+        """Update only the title of an existing note."""
         now = datetime.now(timezone.utc).isoformat()
         
-        cursor.execute("""
-            UPDATE notes 
-            SET title = ?, content = ?, modified_at = ?
-            WHERE id = ?
-        """, (title, content, now, note_id))
+        with self.conn:
+            cursor = self.conn.execute(_SQL_UPDATE_TITLE, (title, now, note_id))
+        return cursor.rowcount > 0
+    
+    def update_content(self, note_id, content):
+        """Update only the content of an existing note."""
+        now = datetime.now(timezone.utc).isoformat()
         
-        conn.commit()
-        success = cursor.rowcount > 0
-        conn.close()
-        return success
+        with self.conn:
+            cursor = self.conn.execute(_SQL_UPDATE_CONTENT, (content, now, note_id))
+        return cursor.rowcount > 0
     
     def delete_note(self, note_id):
         """Delete note by ID."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM notes WHERE id = ?", (note_id,))
-        conn.commit()
-        success = cursor.rowcount > 0
-        conn.close()
-        return success
+        with self.conn:
+            cursor = self.conn.execute(_SQL_DELETE, (note_id,))
+        return cursor.rowcount > 0
     
     def toggle_mark(self, note_id):
         """Toggle mark status."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute("UPDATE notes SET is_marked = NOT is_marked WHERE id = ?", (note_id,))
-        conn.commit()
-        conn.close()
+        with self.conn:
+            self.conn.execute(_SQL_TOGGLE_MARK, (note_id,))
+    
+    def get_note(self, note_id):
+        """Get a single note by ID."""
+        row = self.conn.execute(_SQL_GET_ONE, (note_id,)).fetchone()
+        return dict(row) if row else None
     
     def get_all_notes(self, search_query="", filter_marked=False):
         """Get all notes with optional search and filter."""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        query = "SELECT * FROM notes WHERE 1=1"
-        params = []
-        
         if search_query:
-            query += " AND (title LIKE ? OR content LIKE ?)"
-            params.extend([f"%{search_query}%", f"%{search_query}%"])
-        
-        if filter_marked:
-            query += " AND is_marked = 1"
-        
-        query += " ORDER BY modified_at DESC"
-        
-        cursor.execute(query, params)
-        notes = cursor.fetchall()
-        conn.close()
+            pattern = f"%{search_query}%"
+            query = _SQL_LIST_SEARCH_MARKED if filter_marked else _SQL_LIST_SEARCH
+            params = (pattern, pattern)
+        else:
+            query = _SQL_LIST_MARKED if filter_marked else _SQL_LIST_ALL
+            params = ()
         
+        notes = self.conn.execute(query, params).fetchall()
         return [dict(note) for note in notes]
+    
+    def get_all_notes_fast(self, search_query="", filter_marked=False, conn=None):
+        """List rows for the notes table as plain (id, title, modified_at, is_marked) tuples."""
+        if search_query:
+            pattern = f"%{search_query}%"
+            query = _SQL_LIST_FAST_SEARCH_MARKED if filter_marked else _SQL_LIST_FAST_SEARCH
+            params = (pattern, pattern)
+        else:
+            query = _SQL_LIST_FAST_MARKED if filter_marked else _SQL_LIST_FAST_ALL
+            params = ()
+        
+        # Plain tuples - no sqlite3.Row wrapper or dict conversion per row
+        cursor = (conn or self.conn).cursor()
+        cursor.row_factory = None
+        return cursor.execute(query, params).fetchall()
 
 
 class NotesWidget(QWidget):
@@ -342,6 +440,18 @@ class NotesWidget(QWidget):
         self.shared_log = shared_log
         self.original_title = ""
         self.original_content = ""
+        # Shared styling objects for table rows (reused across load_notes calls)
+        self._bold_font = QFont()
+        self._bold_font.setBold(True)
+        self._gold_brush = QBrush(QColor("#FFD700"))
+        self._white_brush = QBrush(QColor("#ffffff"))
+        # Incremented per load_notes call; results from older loads are dropped
+        self._load_request_id = 0
+        # note_id -> table row, rebuilt by _apply_notes
+        self._note_rows = {}
+        # Owned by the widget so queued results outlive the finished task
+        self._load_signals = _LoadNotesSignals(self)
+        self._load_signals.finished.connect(self._apply_notes)
         self.init_ui()
         self.load_notes()
     
@@ -350,35 +460,6 @@ class NotesWidget(QWidget):
         if self.shared_log:
             self.shared_log.append(message)
     
-    def get_relative_time(self, iso_time_str):
-        """Convert ISO timestamp to relative time string."""
-        try:
-            dt = datetime.fromisoformat(iso_time_str.replace('Z', '+00:00'))
-            now = datetime.now(timezone.utc)
-            diff = now - dt
-            
-            seconds = int(diff.total_seconds())
-            
-            if seconds < 60:
-                return f"{seconds} giây trước"
-            elif seconds < 3600:
-                minutes = seconds // 60
-                return f"{minutes} phút trước"
-            elif seconds < 86400:
-                hours = seconds // 3600
-                return f"{hours} giờ trước"
-            elif seconds < 604800:
-                days = seconds // 86400
-                return f"{days} ngày trước"
-            elif seconds < 2592000:
-                weeks = seconds // 604800
-                return f"{weeks} tuần trước"
-            else:
-                months = seconds // 2592000
-                return f"{months} tháng trước"
-        except:
-            return ""
-    
     def init_ui(self):
         """Initialize UI."""
         layout = QVBoxLayout(self)
@@ -474,40 +555,51 @@ class NotesWidget(QWidget):
         layout.addWidget(splitter)
     
     def load_notes(self, log_search=False):
-        """Load notes from database to table."""
+        """Load notes from database to table (query runs on the thread pool)."""
         search_query = self.search_input.text()
         
-        notes = self.db.get_all_notes(search_query, False)
+        self._load_request_id += 1
+        task = _LoadNotesTask(self.db, self._load_signals, self._load_request_id, search_query, log_search)
+        QThreadPool.globalInstance().start(task)
+    
+    def _apply_notes(self, request_id, rows, search_query, log_search):
+        """Populate the table from a _LoadNotesTask payload (GUI thread)."""
+        # A newer load was started meanwhile - drop this stale result
+        if request_id != self._load_request_id:
+            return
         
-        self.notes_table.setRowCount(0)
+        # Reuse the items already in the table; only rows beyond the current count get new items
+        self.notes_table.clearSelection()
+        self.notes_table.setRowCount(len(rows))
+        self._note_rows = {}
         
         # Only log when Enter is pressed
         if search_query and log_search:
-            self.log(f"🔍 Tìm kiếm: '{search_query}' - Tìm thấy {len(notes)} ghi chú")
-        
-        for note in notes:
-            row = self.notes_table.rowCount()
-            self.notes_table.insertRow(row)
-            
-            # Column 0: Title|||Time format (will be rendered by custom delegate)
-            relative_time = self.get_relative_time(note['modified_at'])
-            display_text = f"{note['title']}|||{relative_time}" if relative_time else f"{note['title']}|||"
-            
-            title_item = QTableWidgetItem(display_text)
+            self.log(f"🔍 Tìm kiếm: '{search_query}' - Tìm thấy {len(rows)} ghi chú")
+        
+        for row, (note_id, title, relative_time, is_marked) in enumerate(rows):
+            title_item = self.notes_table.item(row, 0)
+            if title_item is None:
+                # Always bold for titles
+                title_item = QTableWidgetItem()
+                title_item.setFont(self._bold_font)
+                self.notes_table.setItem(row, 0, title_item)
+                id_item = QTableWidgetItem()
+                self.notes_table.setItem(row, 1, id_item)
+            else:
+                id_item = self.notes_table.item(row, 1)
             
-            # Always bold for titles
-            font = title_item.font()
-            font.setBold(True)
-            title_item.setFont(font)
+            # Column 0: Title as display text, time as item data (rendered by custom delegate)
+            title_item.setText(title)
+            title_item.setData(NOTE_TIME_ROLE, relative_time)
             
             # Gold color for marked notes
-            if note['is_marked'] == 1:
-                title_item.setForeground(QColor("#FFD700"))
-            
-            self.notes_table.setItem(row, 0, title_item)
+            title_item.setData(NOTE_MARKED_ROLE, is_marked)
+            title_item.setForeground(self._gold_brush if is_marked else self._white_brush)
             
             # Column 1: ID (hidden)
-            self.notes_table.setItem(row, 1, QTableWidgetItem(note['id']))
+            id_item.setText(note_id)
+            self._note_rows[note_id] = row
     
     def toggle_mark(self, note_id):
         """Toggle mark for note."""
@@ -523,17 +615,22 @@ class NotesWidget(QWidget):
         note_id = self.notes_table.item(row, 1).text()  # Column 1 is ID
         
         # Load note details
-        notes = self.db.get_all_notes()
-        selected_note = next((n for n in notes if n['id'] == note_id), None)
+        selected_note = self.db.get_note(note_id)
         
         if selected_note:
             self.current_note_id = note_id
             self.title_input.setText(selected_note['title'])
-            self.content_input.setHtml(selected_note['content'] or "")  # Use setHtml for rich text
+            content = selected_note['content'] or ""
+            # Only run the HTML importer for rich text; plain notes take the cheap path
+            if Qt.mightBeRichText(content):
+                self.content_input.setHtml(content)
+            else:
+                self.content_input.setPlainText(content)
+            self.content_input.document().setModified(False)
             
             # Store original values for change tracking
             self.original_title = selected_note['title']
-            self.original_content = selected_note['content'] or ""
+            self.original_content = content
             
             self.log(f"📖 Đang chỉnh sửa: {selected_note['title']}")
     
@@ -548,11 +645,12 @@ class NotesWidget(QWidget):
         self.current_note_id = None
         self.title_input.clear()
         self.content_input.clear()
+        self.content_input.document().setModified(False)
         self.original_title = ""
         self.original_content = ""
     
-    def save_note(self):
-        """Save current note."""
+    def save_note(self, content=None, title_only=False):
+        """Save current note. Existing notes only write the columns that changed."""
         title = self.title_input.text().strip()
         
         if not title:
@@ -560,12 +658,20 @@ class NotesWidget(QWidget):
             self.log("❌ Lỗi: Tiêu đề không được để trống!")
             return
         
-        content = self.content_input.toHtml()  # Save as HTML for rich text
-        
         if self.current_note_id:
             # Update existing
-            success = self.db.update_note(self.current_note_id, title, content)
+            if title_only:
+                # Title-only edit: skip HTML serialization entirely
+                success = self.db.update_title(self.current_note_id, title)
+            else:
+                if content is None:
+                    content = self.content_input.toHtml()  # Save as HTML for rich text
+                if title == self.original_title:
+                    success = self.db.update_content(self.current_note_id, content)
+                else:
+                    success = self.db.update_note(self.current_note_id, title, content)
             if success:
+                self._mark_saved(title, content)
                 self.log(f"💾 Đã cập nhật ghi chú: {title}")
                 self.load_notes()
             else:
@@ -573,11 +679,22 @@ class NotesWidget(QWidget):
                 self.log("❌ Lỗi: Không thể cập nhật ghi chú!")
         else:
             # Add new
+            if content is None:
+                content = self.content_input.toHtml()  # Save as HTML for rich text
             note_id = self.db.add_note(title, content)
             self.current_note_id = note_id
+            self._mark_saved(title, content)
             self.log(f"✅ Đã tạo ghi chú mới: {title}")
             self.load_notes()
     
+    def _mark_saved(self, title, content=None):
+        """Record what was just written so the next focus-out sees a clean editor."""
+        self.original_title = title
+        if content is not None:
+            # Title-only saves leave the body (and its dirty bit) untouched
+            self.original_content = content
+            self.content_input.document().setModified(False)
+    
     def delete_note(self):
         """Delete current note."""
         if not self.current_note_id:
@@ -604,17 +721,28 @@ class NotesWidget(QWidget):
     def auto_save_on_focus_out(self):
         """Auto save when focus leaves input fields - only if changed."""
         title = self.title_input.text().strip()
-        content = self.content_input.toHtml()
+        content_dirty = self.content_input.document().isModified()
         
-        # Check if content has changed
-        has_changed = (title != self.original_title or content != self.original_content)
+        # Cheap dirty check first - skip toHtml() serialization when nothing was edited
+        if not content_dirty and title == self.original_title:
+            return
         
-        # Only auto-save if there's a title and content has changed
-        if title and has_changed:
-            self.save_note()
-            # Update original values after saving
-            self.original_title = title
-            self.original_content = content
+        # Only auto-save if there's a title
+        if not title:
+            return
+        
+        if not content_dirty and self.current_note_id:
+            # Only the title changed - cheaper UPDATE, no HTML serialization
+            self.save_note(title_only=True)
+            return
+        
+        content = self.content_input.toHtml()
+        
+        # Check if content has changed (save_note updates the originals and dirty bit)
+        if title != self.original_title or content != self.original_content:
+            self.save_note(content)
+        else:
+            self.content_input.document().setModified(False)
     
     def show_context_menu(self, position):
         """Show context menu for notes table."""
@@ -626,17 +754,14 @@ class NotesWidget(QWidget):
         # Get note ID
         note_id = self.notes_table.item(row, 1).text()  # Column 1 is ID
         
-        # Get note details to check mark status
-        notes = self.db.get_all_notes()
-        selected_note = next((n for n in notes if n['id'] == note_id), None)
-        if not selected_note:
-            return
+        # Mark status is cached on the row item by load_notes
+        is_marked = self.notes_table.item(row, 0).data(NOTE_MARKED_ROLE)
         
         # Create context menu
         menu = QMenu(self)
         
         # Mark/Unmark action
-        if selected_note['is_marked'] == 1:
+        if is_marked:
             mark_action = QAction("⭐ Bỏ đánh dấu", self)
         else:
             mark_action = QAction("⭐ Đánh dấu", self)
@@ -657,7 +782,17 @@ class NotesWidget(QWidget):
         """Toggle mark status from context menu."""
         self.db.toggle_mark(note_id)
         self.log("⭐ Đã chuyển trạng thái đánh dấu ghi chú")
-        self.load_notes()
+        
+        # A reload may have landed while the menu was open - look the row up again
+        row = self._note_rows.get(note_id)
+        if row is None:
+            return
+        
+        # Marking doesn't touch modified_at, so the row stays put - update it in place
+        title_item = self.notes_table.item(row, 0)
+        is_marked = not title_item.data(NOTE_MARKED_ROLE)
+        title_item.setData(NOTE_MARKED_ROLE, is_marked)
+        title_item.setForeground(self._gold_brush if is_marked else self._white_brush)
     
     def delete_note_from_menu(self, note_id):
         """Delete note from context menu with confirmation."""
@@ -9,20 +9,27 @@ import logging
 import json
 import random
 import sqlite3
+import threading
+import time
 import re
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
 
 # Get logger for this module (will be configured by Main.pyw)
 logger = logging.getLogger('telegram_module')
 
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, pyqtSlot, QObject, QTimer, QRect, QPoint
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QObject, QTimer, QRect, QPoint, QEvent
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
     QTextEdit, QLabel, QFileDialog, QMessageBox, QCheckBox,
     QTableWidget, QTableWidgetItem, QHeaderView, QTabWidget,
-    QComboBox, QMenu, QStyle, QStyledItemDelegate
+    QComboBox, QMenu, QStyle, QStyledItemDelegate, QApplication
 )
-from PyQt6.QtGui import QFont, QAction, QCursor, QPainter, QPen, QColor
+from PyQt6.QtGui import QFont, QAction, QCursor, QPainter, QPen, QColor, QStaticText, QTransform
+
+_ALIGN_CENTER = Qt.AlignmentFlag.AlignCenter
 
 
 class CheckBoxHeader(QHeaderView):
@@ -39,6 +46,31 @@ class CheckBoxHeader(QHeaderView):
         self.setSectionsClickable(True)
         self.sectionClicked.connect(self.on_section_clicked)
         self.setMouseTracking(True)
+        
+        # Pen/brush/font dùng cho mỗi lần vẽ - tạo một lần
+        self._box_pen = QPen(QColor("#555555"), 2)
+        self._box_brush = QColor("#1a1a1a")
+        self._check_pen = QPen(QColor("#00ff00"), 2)
+        self._check_font = QFont('Segoe UI', 10, QFont.Weight.Bold)
+        self._button_pen = QPen(QColor("#333333"), 1)
+        self._button_pressed_brush = QColor("#0d0d0d")
+        self._button_hovered_brush = QColor("#2a2a2a")
+        self._button_brush = QColor("#1a1a1a")
+        self._button_text_pen = QColor("#ffffff")
+        self._button_font = QFont('Segoe UI', 8)
+        
+        # Text tĩnh đã shape sẵn glyph - drawStaticText không shape lại mỗi lần vẽ
+        self._check_static = QStaticText("✓")
+        self._check_static.prepare(QTransform(), self._check_font)
+        self._check_static_size = self._check_static.size()
+        self._button_static = QStaticText("🔍 Check Live")
+        self._button_static.prepare(QTransform(), self._button_font)
+        self._button_static_size = self._button_static.size()
+        
+        # QRect checkbox/button theo rect của section - chỉ đổi khi resize/scroll
+        self._option_rect_cache = {}
+        self._button_rect_cache = {}
+        self.sectionResized.connect(self._clear_rect_cache)
     
     def paintSection(self, painter, rect, logicalIndex):
         """Override paint to draw checkbox in first column and button in last column."""
@@ -48,69 +80,94 @@ class CheckBoxHeader(QHeaderView):
         
         if logicalIndex == 0:
             # Draw checkbox
-            option_rect = QRect(rect.x() + rect.width()//2 - 9, rect.y() + rect.height()//2 - 9, 18, 18)
+            key = (rect.x(), rect.y(), rect.width(), rect.height())
+            option_rect = self._option_rect_cache.get(key)
+            if option_rect is None:
+                option_rect = QRect(rect.x() + rect.width()//2 - 9, rect.y() + rect.height()//2 - 9, 18, 18)
+                self._cache_rect(self._option_rect_cache, key, option_rect)
             
             # Draw checkbox border
-            painter.setPen(QPen(QColor("#555555"), 2))
-            painter.setBrush(QColor("#1a1a1a"))
+            painter.setPen(self._box_pen)
+            painter.setBrush(self._box_brush)
             painter.drawRoundedRect(option_rect, 4, 4)
             
             # Draw checkmark if checked
             if self.is_checked:
-                painter.setPen(QPen(QColor("#00ff00"), 2))
-                painter.setFont(QFont('Segoe UI', 10, QFont.Weight.Bold))
-                painter.drawText(option_rect, Qt.AlignmentFlag.AlignCenter, "✓")
+                painter.setPen(self._check_pen)
+                painter.setFont(self._check_font)
+                self._draw_static_centered(painter, option_rect, self._check_static, self._check_static_size)
         
         elif logicalIndex == 7:  # Last column - Live
             # Draw button
-            button_rect = QRect(rect.x() + 5, rect.y() + 5, rect.width() - 10, rect.height() - 10)
+            key = (rect.x(), rect.y(), rect.width(), rect.height())
+            button_rect = self._button_rect_cache.get(key)
+            if button_rect is None:
+                button_rect = QRect(rect.x() + 5, rect.y() + 5, rect.width() - 10, rect.height() - 10)
+                self._cache_rect(self._button_rect_cache, key, button_rect)
             
             # Button color based on state
             if self.button_pressed:
-                bg_color = QColor("#0d0d0d")
+                bg_color = self._button_pressed_brush
             elif self.button_hovered:
-                bg_color = QColor("#2a2a2a")
+                bg_color = self._button_hovered_brush
             else:
-                bg_color = QColor("#1a1a1a")
+                bg_color = self._button_brush
             
-            painter.setPen(QPen(QColor("#333333"), 1))
+            painter.setPen(self._button_pen)
             painter.setBrush(bg_color)
             painter.drawRoundedRect(button_rect, 3, 3)
             
             # Draw button text
-            painter.setPen(QColor("#ffffff"))
-            painter.setFont(QFont('Segoe UI', 8))
-            painter.drawText(button_rect, Qt.AlignmentFlag.AlignCenter, "🔍 Check Live")
+            painter.setPen(self._button_text_pen)
+            painter.setFont(self._button_font)
+            self._draw_static_centered(painter, button_rect, self._button_static, self._button_static_size)
+    
+    @staticmethod
+    def _cache_rect(cache, key, rect):
+        """Store a computed rect; horizontal scrolling creates new keys, so keep the cache small."""
+        if len(cache) >= 32:
+            cache.clear()
+        cache[key] = rect
+    
+    def _clear_rect_cache(self, *args):
+        self._option_rect_cache.clear()
+        self._button_rect_cache.clear()
+    
+    def resizeEvent(self, event):
+        self._clear_rect_cache()
+        super().resizeEvent(event)
+    
+    @staticmethod
+    def _draw_static_centered(painter, rect, static_text, size):
+        """Draw a prepared QStaticText centered in rect."""
+        painter.drawStaticText(
+            int(rect.x() + (rect.width() - size.width()) / 2),
+            int(rect.y() + (rect.height() - size.height()) / 2),
+            static_text
+        )
     
     def mouseMoveEvent(self, event):
-        """Track mouse movement for button hover effect."""
-        logical_index = self.logicalIndexAt(event.pos())
-        if logical_index == 7:
-            rect = self.sectionViewportPosition(7)
-            section_rect = QRect(rect, 0, self.sectionSize(7), self.height())
-            self.button_hovered = section_rect.contains(event.pos().x(), event.pos().y())
+        """Track mouse movement for button hover effect (repaint only when hover changes)."""
+        hovered = self.logicalIndexAt(event.position().toPoint()) == 7
+        if hovered != self.button_hovered:
+            self.button_hovered = hovered
             self.viewport().update()
-        else:
-            if self.button_hovered:
-                self.button_hovered = False
-                self.viewport().update()
         super().mouseMoveEvent(event)
     
     def mousePressEvent(self, event):
         """Handle mouse press for button."""
-        logical_index = self.logicalIndexAt(event.pos())
-        if logical_index == 7:
+        if self.logicalIndexAt(event.position().toPoint()) == 7 and not self.button_pressed:
             self.button_pressed = True
             self.viewport().update()
         super().mousePressEvent(event)
     
     def mouseReleaseEvent(self, event):
         """Handle mouse release for button."""
-        logical_index = self.logicalIndexAt(event.pos())
-        if logical_index == 7 and self.button_pressed:
-            self.check_live_clicked.emit()
-        self.button_pressed = False
-        self.viewport().update()
+        if self.button_pressed:
+            if self.logicalIndexAt(event.position().toPoint()) == 7:
+                self.check_live_clicked.emit()
+            self.button_pressed = False
+            self.viewport().update()
         super().mouseReleaseEvent(event)
     
     def on_section_clicked(self, logicalIndex):
@@ -129,31 +186,47 @@ class CheckBoxHeader(QHeaderView):
 ICONS_DIR = os.path.join(os.path.dirname(__file__), "..", "..", "icons")
 
 
-class CustomCheckBox(QCheckBox):
-    """Custom checkbox with green checkmark."""
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
+class SessionCheckDelegate(QStyledItemDelegate):
+    """Draw the checkable column-0 item as a dark box with green checkmark and toggle it on click."""
+    # Dùng chung cho mọi dòng - không tạo lại mỗi lần vẽ
+    _BOX_PEN = QPen(QColor("#555555"), 2)
+    _BOX_CHECKED_PEN = QPen(QColor("#00aaff"), 2)
+    _BOX_BRUSH = QColor("#1a1a1a")
+    _CHECK_FONT = QFont('Segoe UI', 12, QFont.Weight.Bold)
+    _CHECK_PEN = QPen(QColor("#00ff00"), 2)
+    
+    _CHECKED = (Qt.CheckState.Checked, Qt.CheckState.Checked.value)  # Model trả về int hoặc enum
+    
+    @staticmethod
+    def _box_rect(rect):
+        return QRect(rect.x() + rect.width()//2 - 9, rect.y() + rect.height()//2 - 9, 18, 18)
     
-    def paintEvent(self, event):
-        """Override paint to draw custom checkmark."""
-        super().paintEvent(event)
+    def paint(self, painter, option, index):
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
         
-        if self.isChecked():
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-            
+        checked = index.data(Qt.ItemDataRole.CheckStateRole) in self._CHECKED
+        box_rect = self._box_rect(option.rect)
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(self._BOX_CHECKED_PEN if checked else self._BOX_PEN)
+        painter.setBrush(self._BOX_BRUSH)
+        painter.drawRoundedRect(box_rect, 4, 4)
+        if checked:
             # Draw green checkmark (✓)
-            pen = QPen(QColor("#00ff00"))
-            pen.setWidth(2)
-            painter.setPen(pen)
-            painter.setFont(QFont('Segoe UI', 12, QFont.Weight.Bold))
-            
-            # Calculate center position
-            rect = self.rect()
-            text_rect = QRect(0, 0, 18, 18)  # Checkbox indicator size
-            
-            # Draw checkmark
-            painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, "✓")
+            painter.setPen(self._CHECK_PEN)
+            painter.setFont(self._CHECK_FONT)
+            painter.drawText(box_rect, Qt.AlignmentFlag.AlignCenter, "✓")
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        """Toggle check state on left click anywhere in the cell."""
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            checked = index.data(Qt.ItemDataRole.CheckStateRole) in self._CHECKED
+            new_state = Qt.CheckState.Unchecked if checked else Qt.CheckState.Checked
+            model.setData(index, new_state.value, Qt.ItemDataRole.CheckStateRole)
+            return True
+        return event.type() in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonDblClick)
 
 
 def get_icon(icon_name):
@@ -176,23 +249,56 @@ except ImportError:
     TELETHON_AVAILABLE = False
     logger.warning("Telethon not installed. Telegram features will be disabled.")
 
+# orjson nhanh hơn json chuẩn nhiều lần và ra bytes trực tiếp; không có thì dùng json
+try:
+    import orjson
+
+    def _json_dumps(value):
+        return orjson.dumps(value)
+
+    _json_loads = orjson.loads
+except ImportError:
+    def _json_dumps(value):
+        return json.dumps(value, ensure_ascii=False).encode("utf-8")
+
+    _json_loads = json.loads
+
+# uvloop (libuv) cho loop asyncio của các worker nếu có - không hỗ trợ Windows
+UVLOOP_AVAILABLE = False
+if sys.platform != "win32":
+    try:
+        import uvloop
+        UVLOOP_AVAILABLE = True
+    except ImportError:
+        pass
+
 # Configuration paths
 tool_dir = os.path.dirname(os.path.abspath(__file__))
 config_dir = os.path.join(tool_dir, "config")
 data_dir = os.path.join(tool_dir, "data")
 
-# Ensure directories exist
-os.makedirs(config_dir, exist_ok=True)
-os.makedirs(data_dir, exist_ok=True)
-
 # Config files
-seeding_config_file = os.path.join(config_dir, "seeding_config.json")
+seeding_config_file = os.path.join(config_dir, "seeding_config.json")  # Legacy - import only
 session_folder_path_file = os.path.join(config_dir, "session_folder_path.txt")
-session_groups_file = os.path.join(config_dir, "session_groups.json")
+session_groups_file = os.path.join(config_dir, "session_groups.json")  # Legacy - import only
 admin_session_file_path = os.path.join(config_dir, "admin_session_path.txt")
 admin_responses_file = os.path.join(config_dir, "admin_responses.txt")
 sample_script_file = os.path.join(config_dir, "sample_script.txt")
-session_cache_file = os.path.join(data_dir, "session_cache.json")  # Cache persistent cho sessions
+session_cache_file = os.path.join(data_dir, "session_cache.json")  # Legacy - import only
+
+# State DB (SQLite WAL): seeding config, session groups, session cache.
+# Các file JSON cũ chỉ còn được đọc một lần để import.
+# Mở lazy ở lần đọc/ghi đầu tiên, không làm I/O lúc import module.
+state_db_file = os.path.join(data_dir, "telegram_state.db")
+_state_db = None
+_state_db_lock = threading.Lock()
+_dirs_ready = False
+
+# Mỗi session trong cache là một dòng riêng: "session_cache/<session_path>"
+_SESSION_CACHE_PREFIX = "session_cache/"
+_SESSION_CACHE_PREFIX_END = "session_cache0"  # '0' là ký tự ngay sau '/'
+# Đánh dấu đã import session_cache.json (nằm ngoài khoảng prefix ở trên)
+_SESSION_CACHE_IMPORTED_KEY = "session_cache_imported"
 
 # API ID và API Hash cố định
 SCENARIO_API_ID = 28610130
@@ -206,8 +312,39 @@ DEFAULT_ADMIN_RESPONSES = [
     "Dạ anh vào inbox xem thông tin nhé"
 ]
 
+# Max sessions seeding at the same time (pool size, independent of batch pacing)
+SEEDING_MAX_PARALLEL = 20
+
+# Số kết nối tối đa khi check session trước khi chạy
+PREFLIGHT_MAX_PARALLEL = 20
+
+# Số session check live cùng lúc
+CHECK_LIVE_MAX_PARALLEL = 32
+
+# Thời gian tối đa (giây) cho một lần check session, quá thì tính là Die
+CHECK_LIVE_TIMEOUT = 15
+
+# Số client đã kết nối được giữ lại giữa preflight và lúc chạy (trên mức này thì đóng luôn)
+CLIENT_POOL_MAX_IDLE = 100
+
+# Số thread của default executor trên loop chung (Telethon chỉ dùng cho việc I/O file nhỏ)
+ASYNC_EXECUTOR_MAX_WORKERS = 4
+
+# Trạng thái session từ worker được gom và gửi sang GUI theo lô mỗi 100 ms
+STATUS_FLUSH_INTERVAL = 0.1
+
+# Thông tin phone/tên/username trong cache còn dùng được trong 7 ngày (bỏ qua get_me)
+SESSION_IDENTITY_MAX_AGE = 7 * 24 * 3600
+
 # Emoji list for random message variation
 EMOJI_LIST = ["😊", "👍", "🔥", "💥", "🚀", "💎"]
+_EMOJIS = tuple(EMOJI_LIST)
+_MESSAGE_TRANSLATE = str.maketrans({"ạ": "a", "A": "a"})
+
+# Số điện thoại trong tên file / dữ liệu session (10-15 chữ số, có thể có +)
+_PHONE_RE = re.compile(r'\+?\d{10,15}')
+# Dòng bắt đầu bằng link nhóm, bỏ khoảng trắng cuối dòng - regex quét cả khối text một lượt trong C
+_TME_LINK_RE = re.compile(r'^(https://t\.me/.*?)[^\S\n]*$', re.MULTILINE)
 
 # Sample scripts
 SAMPLE_SCRIPTS = [
@@ -217,6 +354,76 @@ SAMPLE_SCRIPTS = [
     "Mình vừa tìm được một mẹo hay, ai muốn mình chia sẻ không? 🚀"
 ]
 
+def _ensure_dirs():
+    """Create config/data directories on first use."""
+    global _dirs_ready
+    if not _dirs_ready:
+        os.makedirs(config_dir, exist_ok=True)
+        os.makedirs(data_dir, exist_ok=True)
+        _dirs_ready = True
+
+def _state_db_conn():
+    """Return the state DB connection, opening it on first use. Caller holds _state_db_lock."""
+    global _state_db
+    if _state_db is None:
+        _ensure_dirs()
+        _state_db = sqlite3.connect(state_db_file, isolation_level=None, check_same_thread=False)
+        _state_db.executescript(
+            "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL; PRAGMA busy_timeout=5000; "
+            "CREATE TABLE IF NOT EXISTS kv(k TEXT PRIMARY KEY, v BLOB);"
+        )
+    return _state_db
+
+def _kv_get(key):
+    """Read one value from the state DB (None if missing)."""
+    with _state_db_lock:
+        row = _state_db_conn().execute("SELECT v FROM kv WHERE k = ?", (key,)).fetchone()
+    return _json_loads(row[0]) if row else None
+
+def _kv_set(key, value):
+    """Upsert one value into the state DB."""
+    with _state_db_lock:
+        _state_db_conn().execute("INSERT OR REPLACE INTO kv VALUES (?, ?)", (key, _json_dumps(value)))
+
+def _kv_batch_update(items):
+    """Upsert many {key: value} pairs in a single transaction (one WAL commit)."""
+    rows = [(k, _json_dumps(v)) for k, v in items.items()]
+    if not rows:
+        return
+    with _state_db_lock:
+        db = _state_db_conn()
+        db.execute("BEGIN IMMEDIATE")  # Lấy write lock ngay, không nâng cấp giữa chừng
+        try:
+            db.executemany("INSERT OR REPLACE INTO kv VALUES (?, ?)", rows)
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+def _load_legacy_json(path):
+    """Read an old JSON config/cache file for one-time import (None if absent)."""
+    try:
+        with open(path, "rb") as f:
+            return _json_loads(f.read())
+    except FileNotFoundError:
+        return None
+
+def read_text_file(path):
+    """Stripped content of a small text file, or None if it does not exist."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return None
+
+def parse_group_links(text):
+    """Telegram group links (lines starting with https://t.me/) from a text box, in order."""
+    return tuple(_TME_LINK_RE.findall(text))
+
+def non_empty_lines(text):
+    """Stripped, non-empty lines of a text box - strip mỗi dòng đúng một lần."""
+    return [line for line in map(str.strip, text.split("\n")) if line]
+
 def save_seeding_config(group_links, delay_time, admin_delay_time, random_delay, scenario_text="", group_join_links="", 
                         auto_schedule=False, schedule_time="18:00", selected_group="Tất cả sessions"):
     config = {
@@ -231,31 +438,32 @@ def save_seeding_config(group_links, delay_time, admin_delay_time, random_delay,
         "selected_group": selected_group  # Lưu nhóm đã chọn
     }
     try:
-        with open(seeding_config_file, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=4)
+        _kv_set("seeding_config", config)
         # Removed auto-save log to reduce spam
     except Exception as e:
         logger.error(f"Lỗi khi lưu seeding config: {str(e)}")
 
 def save_session_groups(session_groups):
-    """Save session groups to file."""
+    """Save session groups to state DB."""
     try:
-        with open(session_groups_file, "w", encoding="utf-8") as f:
-            json.dump(session_groups, f, indent=4, ensure_ascii=False)
+        _kv_set("session_groups", session_groups)
         logger.info(f"💾 Đã lưu {len(session_groups)} nhóm session")
     except Exception as e:
         logger.error(f"❌ Lỗi khi lưu session groups: {str(e)}")
 
 def load_session_groups():
-    """Load session groups from file."""
-    if os.path.exists(session_groups_file):
-        try:
-            with open(session_groups_file, "r", encoding="utf-8") as f:
-                groups = json.load(f)
-            logger.info(f"📂 Đã load {len(groups)} nhóm session")
-            return groups
-        except Exception as e:
-            logger.error(f"❌ Lỗi khi load session groups: {str(e)}")
+    """Load session groups from state DB (import từ session_groups.json lần đầu)."""
+    try:
+        groups = _kv_get("session_groups")
+        if groups is None:
+            groups = _load_legacy_json(session_groups_file)
+            if groups is None:
+                return {}
+            _kv_set("session_groups", groups)
+        logger.info(f"📂 Đã load {len(groups)} nhóm session")
+        return groups
+    except Exception as e:
+        logger.error(f"❌ Lỗi khi load session groups: {str(e)}")
     return {}
 
 def load_seeding_config():
@@ -270,11 +478,13 @@ def load_seeding_config():
         "schedule_time": "18:00",
         "selected_group": "Tất cả sessions"  # Lưu nhóm đã chọn
     }
-    if not os.path.exists(seeding_config_file):
-        return default_config
     try:
-        with open(seeding_config_file, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = _kv_get("seeding_config")
+        if config is None:
+            config = _load_legacy_json(seeding_config_file)
+            if config is None:
+                return default_config
+            _kv_set("seeding_config", config)
         for key in default_config:
             if key not in config:
                 config[key] = default_config[key]
@@ -285,74 +495,350 @@ def load_seeding_config():
 
 def save_admin_responses(responses):
     try:
+        _ensure_dirs()
         with open(admin_responses_file, "w", encoding="utf-8") as f:
             f.write(responses)
     except Exception as e:
         logger.error(f"Lỗi khi lưu admin responses: {str(e)}")
 
-def save_session_cache(session_cache):
-    """Save session cache to file."""
+def save_session_cache(session_cache, session_paths=None):
+    """
+    Save session cache to state DB.
+    Chỉ ghi các session trong session_paths (nếu có), không ghi lại toàn bộ cache.
+    """
+    if session_paths is None:
+        session_paths = session_cache.keys()
     try:
-        with open(session_cache_file, "w", encoding="utf-8") as f:
-            json.dump(session_cache, f, indent=4, ensure_ascii=False)
-        # logger.debug(f"💾 Đã lưu cache cho {len(session_cache)} sessions")
+        _kv_batch_update({
+            _SESSION_CACHE_PREFIX + path: session_cache[path]
+            for path in session_paths if path in session_cache
+        })
     except Exception as e:
         logger.error(f"❌ Lỗi khi lưu session cache: {str(e)}")
 
 def load_session_cache():
-    """Load session cache from file."""
-    if os.path.exists(session_cache_file):
-        try:
-            with open(session_cache_file, "r", encoding="utf-8") as f:
-                cache = json.load(f)
-            logger.info(f"📂 Đã load cache cho {len(cache)} sessions")
-            return cache
-        except Exception as e:
-            logger.error(f"❌ Lỗi khi load session cache: {str(e)}")
+    """Load session cache from state DB (import từ session_cache.json lần đầu)."""
+    try:
+        with _state_db_lock:
+            rows = _state_db_conn().execute(
+                "SELECT k, v FROM kv WHERE k >= ? AND k < ?",
+                (_SESSION_CACHE_PREFIX, _SESSION_CACHE_PREFIX_END)
+            ).fetchall()
+        prefix_len = len(_SESSION_CACHE_PREFIX)
+        cache = {k[prefix_len:]: _json_loads(v) for k, v in rows}
+        if not cache and not _kv_get(_SESSION_CACHE_IMPORTED_KEY):
+            # Chỉ import file JSON cũ một lần - cache rỗng về sau không đọc lại file
+            cache = _load_legacy_json(session_cache_file) or {}
+            items = {_SESSION_CACHE_PREFIX + path: entry for path, entry in cache.items()}
+            items[_SESSION_CACHE_IMPORTED_KEY] = True
+            _kv_batch_update(items)
+        logger.info(f"📂 Đã load cache cho {len(cache)} sessions")
+        return cache
+    except Exception as e:
+        logger.error(f"❌ Lỗi khi load session cache: {str(e)}")
     return {}
 
-# Worker QThread: Joining Groups
+def fresh_session_identities(session_cache, session_paths):
+    """
+    Return {session_path: (phone, full_name, username)} for sessions whose cached
+    identity was fetched less than SESSION_IDENTITY_MAX_AGE ago.
+    """
+    min_updated_at = time.time() - SESSION_IDENTITY_MAX_AGE
+    identities = {}
+    for path in session_paths:
+        entry = session_cache.get(path)
+        if entry and entry.get('updated_at', 0) >= min_updated_at and entry.get('phone'):
+            identities[path] = (entry['phone'], entry.get('full_name', ""), entry.get('username', ""))
+    return identities
+
+def filename_phone(session_file):
+    """Phone number parsed from a session filename, or the filename without extension."""
+    # Remove .session extension
+    name_without_ext = session_file.replace('.session', '')
+    
+    # Check if filename is or contains a phone number
+    # Pattern: numbers, possibly with + at start
+    phone_match = _PHONE_RE.search(name_without_ext)
+    if phone_match:
+        return phone_match.group(0)
+    
+    # Fallback - return filename without extension
+    return name_without_ext
+
+def read_session_phone(session_path, session_file):
+    """
+    Extract phone number from session file.
+    Filenames containing a phone number never get here (load_sessions_to_table dùng filename_phone).
+    Try multiple methods:
+    1. Read from .session SQLite database
+    2. Return filename as fallback
+    """
+    # Method 1: Try to read from .session database
+    if TELETHON_AVAILABLE:
+        try:
+            # Mở read-only + immutable: không tạo -journal/-wal, không lấy lock trên file session
+            conn = sqlite3.connect(Path(session_path).absolute().as_uri() + "?mode=ro&immutable=1", uri=True)
+            try:
+                # Telethon stores DC info in sessions table
+                row = conn.execute("SELECT * FROM sessions LIMIT 1").fetchone()
+            finally:
+                conn.close()
+            
+            # If we have data, try to extract phone from the session
+            # This is a simplified approach - full parsing would need telethon's internal format
+            if row:
+                # Try to find phone in session data using regex
+                session_str = str(row)
+                phone_match = _PHONE_RE.search(session_str)
+                if phone_match:
+                    return phone_match.group(0)
+        except Exception:
+            pass
+    
+    # Method 2: Fallback - return filename without extension
+    return session_file.replace('.session', '')
+
+def lookup_session_phone(session_path, session_file, cached_mtime, cached_phone):
+    """
+    (session_path, phone, mtime) read from the .session file, or None when the file is
+    unchanged since cached_mtime (cached_phone still valid) or cannot be stat'ed.
+    """
+    try:
+        mtime = os.stat(session_path).st_mtime
+    except OSError:
+        return None
+    if mtime == cached_mtime and cached_phone:
+        return None
+    return session_path, read_session_phone(session_path, session_file), mtime
+
+@asynccontextmanager
+async def session_client(session_path, connection=None):
+    """
+    Open one TelegramClient for a session and keep it connected for the whole block.
+    Yields None if the session is not authorized (session die).
+    """
+    client = TelegramClient(session_path, SCENARIO_API_ID, SCENARIO_API_HASH,
+                            connection=connection or ConnectionTcpAbridged)
+    try:
+        await client.connect()
+        yield client if await client.is_user_authorized() else None
+    finally:
+        if client.is_connected():
+            await client.disconnect()
+
+class SessionClientPool:
+    """
+    Connected TelegramClients by session_path for one worker run, so the connection
+    opened by the preflight check is reused for the session's join/send.
+    """
+    def __init__(self, max_idle=CLIENT_POOL_MAX_IDLE):
+        self.max_idle = max_idle
+        self.idle = {}
+
+    @asynccontextmanager
+    async def session(self, session_path, keep=True):
+        """
+        Like session_client, but takes an idle pooled client if there is one.
+        keep=True returns the client to the pool afterwards instead of disconnecting.
+        """
+        client = self.idle.pop(session_path, None)
+        reuse = client is not None and client.is_connected()
+        if not reuse:
+            client = TelegramClient(session_path, SCENARIO_API_ID, SCENARIO_API_HASH,
+                                    connection=ConnectionTcpAbridged)
+        keep_client = False
+        try:
+            if not reuse:
+                await client.connect()
+            authorized = await client.is_user_authorized()
+            yield client if authorized else None
+            keep_client = keep and authorized
+        finally:
+            if keep_client and len(self.idle) < self.max_idle:
+                self.idle[session_path] = client
+            elif client.is_connected():
+                await client.disconnect()
+
+    async def aclose(self):
+        """Disconnect every idle client."""
+        clients = list(self.idle.values())
+        self.idle.clear()
+        for client in clients:
+            try:
+                await client.disconnect()
+            except Exception:
+                pass
+
+def identity_from_me(me):
+    """(phone, full_name, username) for the table from a get_me() user."""
+    return (
+        me.phone if me.phone else "N/A",
+        f"{me.first_name or ''} {me.last_name or ''}".strip() or "N/A",
+        f"@{me.username}" if me.username else ""
+    )
+
+async def preflight_sessions(session_paths, identities, on_fetched=None, pool=None):
+    """
+    Check all sessions in parallel (PREFLIGHT_MAX_PARALLEL connections at a time) before a run.
+    Sessions without a cached identity get get_me here; identities is updated in place
+    and on_fetched(session_path, phone, full_name, username) is called for each fetch.
+    With a pool, live clients stay connected in it for the run.
+    Returns the set of dead (unauthorized / unreachable) session paths.
+    """
+    sem = asyncio.Semaphore(PREFLIGHT_MAX_PARALLEL)
+
+    async def check(session_path):
+        async with sem:
+            try:
+                async with (pool.session(session_path) if pool else session_client(session_path)) as client:
+                    if client is None:
+                        return session_path, False
+                    if session_path not in identities:
+                        identity = identity_from_me(await client.get_me())
+                        identities[session_path] = identity
+                        if on_fetched:
+                            on_fetched(session_path, *identity)
+                    return session_path, True
+            except Exception as e:
+                logger.error("Lỗi kết nối session %s: %s", session_path, e)
+                return session_path, False
+
+    results = await asyncio.gather(*(check(path) for path in session_paths))
+    return {path for path, alive in results if not alive}
+
+class SessionStatusBuffer:
+    """
+    Coalesce per-session status updates from a worker and emit them as one list
+    (update_session_statuses) every STATUS_FLUSH_INTERVAL instead of one signal each.
+    """
+    def __init__(self, signal):
+        self.signal = signal
+        self.pending = []
+        self._wake = None  # asyncio.Event, tạo trong run() trên loop của worker
+
+    def add(self, *status):
+        """Queue one row tuple, e.g. (row, phone, full_name, username, message, status, session_path)."""
+        self.pending.append(status)
+        if self._wake is not None:
+            self._wake.set()
+
+    def flush(self):
+        if self.pending:
+            self.signal.emit(self.pending)
+            self.pending = []
+
+    async def run(self):
+        """
+        Flush loop - chạy song song với worker, bị cancel khi worker kết thúc.
+        Chỉ thức dậy khi có trạng thái mới, không poll trong lúc worker đang chờ delay.
+        """
+        self._wake = asyncio.Event()
+        while True:
+            await self._wake.wait()
+            await asyncio.sleep(STATUS_FLUSH_INTERVAL)  # Gom thêm các trạng thái tới trong 100 ms
+            self._wake.clear()
+            self.flush()
+
+class AsyncLoopThread(threading.Thread):
+    """One background asyncio loop shared by all Telegram workers (join, seeding, check live)."""
+    def __init__(self):
+        super().__init__(name="telegram-asyncio", daemon=True)
+        self.loop = uvloop.new_event_loop() if UVLOOP_AVAILABLE else asyncio.new_event_loop()
+        self.loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=ASYNC_EXECUTOR_MAX_WORKERS, thread_name_prefix="tg-io")
+        )
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """Schedule a coroutine on the loop from any thread; returns a concurrent Future."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future.add_done_callback(_log_worker_error)
+        return future
+
+def _log_worker_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"❌ Worker lỗi: {future.exception()}")
+
+async def wait_unless_stopped(stop_event, seconds):
+    """Chờ tối đa `seconds` giây, trả về ngay khi stop_event được set. Returns True nếu đã dừng."""
+    if seconds > 0 and not stop_event.is_set():
+        try:
+            await asyncio.wait_for(stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+    return stop_event.is_set()
+
+
+def wake_stop_event(loop, stop_event):
+    """Set stop_event từ thread GUI (asyncio.Event không thread-safe)."""
+    if loop is None or stop_event is None:
+        return
+    try:
+        loop.call_soon_threadsafe(stop_event.set)
+    except RuntimeError:
+        pass  # Loop đã đóng - worker đã kết thúc
+
+
+# Worker: Joining Groups
 class JoinGroupWorker(QObject):
     update_message = pyqtSignal(str, str)  # (message, color)
     finished = pyqtSignal(int, int)  # (successful_joins, failed_joins)
     progress = pyqtSignal(int, int)  # (current, total)
-    update_session_status = pyqtSignal(int, str, str, str, str, str, str)  # row, phone, full_name, username, message, status, session_path
+    update_session_statuses = pyqtSignal(list)  # [(row, phone, full_name, username, message, status, session_path), ...]
+    delay_started = pyqtSignal(int, str)  # (seconds, message template) - GUI tự đếm ngược
+    delay_finished = pyqtSignal()
+    identity_fetched = pyqtSignal(str, str, str, str)  # session_path, phone, full_name, username
 
-    def __init__(self, session_paths, group_links, delay_time, random_delay):
+    def __init__(self, session_paths, group_links, delay_time, random_delay, identities=None):
         super().__init__()
+        self.status_buffer = SessionStatusBuffer(self.update_session_statuses)
         self.session_paths = session_paths  # List of full session paths
+        self.identities = identities or {}  # Cached (phone, full_name, username) còn mới
         self.group_links = group_links
-        self.delay_time = delay_time
+        self.delay_time = float(delay_time or 0)  # Chuẩn hoá một lần, vòng lặp chỉ dùng số
         self.random_delay = random_delay
+        self._jitter = bool(random_delay)
+        self._rng = random.Random(os.urandom(8))  # RNG riêng của worker, không dùng chung random toàn cục
         self.is_running = False
         self.should_stop = False
+        self._loop = None
+        self._stop_event = None
 
     def get_delay(self, base_delay):
-        if self.random_delay:
-            return random.uniform(base_delay * 0.8, base_delay * 1.2)
-        return base_delay
+        if not self._jitter:
+            return base_delay
+        return base_delay * self._rng.uniform(0.8, 1.2)
 
-    async def join_group(self, session_path, api_id, api_hash, group_link):
-        client = TelegramClient(session_path, api_id, api_hash, connection=ConnectionTcpAbridged)
-        await client.connect()
+    async def _sleep_unless_stopped(self, seconds):
+        """Sleep up to `seconds`, returning early on stop. Returns True if stopped."""
+        return await wait_unless_stopped(self._stop_event, seconds)
 
-        if not await client.is_user_authorized():
-            logger.error(f"Session {session_path} không hợp lệ!")
+    async def join_group(self, client, session_path, group_link):
+        """Join one group with an already-connected client (None = session die)."""
+        if client is None:
             return False
 
         try:
             await client(JoinChannelRequest(group_link))
-            logger.info(f"Đã tham gia nhóm {group_link} từ session {session_path}")
-            await client.disconnect()
+            logger.info("Đã tham gia nhóm %s từ session %s", group_link, session_path)
             return True
         except Exception as e:
-            logger.error(f"Không thể tham gia nhóm {group_link}: {str(e)}")
+            logger.error("Không thể tham gia nhóm %s: %s", group_link, e)
             return False
 
     async def run_async(self):
         if self.is_running:
             return
         self.is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        if self.should_stop:
+            self._stop_event.set()
+        flush_task = None
+        client_pool = SessionClientPool()
 
         try:
             if not self.session_paths:
@@ -366,163 +852,175 @@ class JoinGroupWorker(QObject):
                 return
 
             self.update_message.emit(f"Đang tham gia các nhóm với {len(self.session_paths)} sessions...", "blue")
-
-            api_id = SCENARIO_API_ID
-            api_hash = SCENARIO_API_HASH
+            flush_task = asyncio.create_task(self.status_buffer.run())
 
             successful_joins = 0
             failed_joins = 0
             total_joins_needed = len(self.group_links) * len(self.session_paths)
             current_join = 0
 
+            # Check song song trước: session die báo ngay, không chạy vòng join + delay cho nó
+            dead_paths = await preflight_sessions(self.session_paths, self.identities, self.identity_fetched.emit, client_pool)
+            for idx, session_path in enumerate(self.session_paths):
+                if session_path in dead_paths:
+                    current_join += len(self.group_links)
+                    failed_joins += len(self.group_links)
+                    self.status_buffer.add(idx, "N/A", "N/A", "", "Tham gia nhóm", "Session die", session_path)
+            if dead_paths:
+                self.progress.emit(current_join, total_joins_needed)
+                self.update_message.emit(f"⚠️ {len(dead_paths)} session die - bỏ qua", "red")
+
             for idx, session_path in enumerate(self.session_paths):
                 if self.should_stop:
                     break
+                if session_path in dead_paths:
+                    continue
+
+                phone_number = "N/A"
+                full_name = "N/A"
+                username = ""
+                session_joins = 0
 
-                # Lấy thông tin thật từ Telegram
+                # Một kết nối cho cả session: get_me + join tất cả các nhóm
                 try:
-                    client = TelegramClient(session_path, api_id, api_hash, connection=ConnectionTcpAbridged)
-                    await client.connect()
-                    
-                    if await client.is_user_authorized():
-                        me = await client.get_me()
-                        phone_number = me.phone if me.phone else "N/A"
-                        full_name = f"{me.first_name or ''} {me.last_name or ''}".strip() or "N/A"
-                        username = f"@{me.username}" if me.username else ""
-                    else:
-                        phone_number = "N/A"
-                        full_name = "N/A"
-                        username = ""
-                    
-                    await client.disconnect()
+                    async with client_pool.session(session_path, keep=False) as client:
+                        if client is None:
+                            logger.error("Session %s không hợp lệ!", session_path)
+                        elif session_path in self.identities:
+                            phone_number, full_name, username = self.identities[session_path]
+                        else:
+                            phone_number, full_name, username = identity_from_me(await client.get_me())
+                            self.identity_fetched.emit(session_path, phone_number, full_name, username)
+
+                        for group_link in self.group_links:
+                            if self.should_stop:
+                                break
+
+                            current_join += 1
+                            session_joins += 1
+                            self.progress.emit(current_join, total_joins_needed)
+                            self.status_buffer.add(
+                                idx, phone_number, full_name, username,
+                                "Tham gia nhóm", "Đang xử lý...", session_path
+                            )
+
+                            result = await self.join_group(client, session_path, group_link)
+
+                            if result:
+                                successful_joins += 1
+                                self.status_buffer.add(
+                                    idx, phone_number, full_name, username,
+                                    "Tham gia nhóm", "Hoàn Thành!", session_path
+                                )
+                            else:
+                                failed_joins += 1
+                                self.status_buffer.add(
+                                    idx, phone_number, full_name, username,
+                                    "Tham gia nhóm", "Thất bại!", session_path
+                                )
+
+                            # Apply delay
+                            if current_join < total_joins_needed and not self.should_stop:
+                                delay = self.get_delay(self.delay_time)
+                                self.delay_started.emit(int(delay), "Chờ tham gia tiếp theo... Còn {} giây")
+                                await self._sleep_unless_stopped(delay)
+                                self.delay_finished.emit()
                 except Exception as e:
-                    logger.error(f"Lỗi lấy thông tin session: {e}")
-                    phone_number = "N/A"
-                    full_name = "N/A"
-                    username = ""
-
-                for group_link in self.group_links:
-                    if self.should_stop:
-                        break
-
-                    current_join += 1
-                    self.progress.emit(current_join, total_joins_needed)
-                    self.update_session_status.emit(
+                    # Không kết nối được session: các nhóm còn lại tính là thất bại
+                    logger.error("Lỗi kết nối session %s: %s", session_path, e)
+                    skipped = len(self.group_links) - session_joins
+                    current_join += skipped
+                    failed_joins += skipped
+                    self.status_buffer.add(
                         idx, phone_number, full_name, username,
-                        "Tham gia nhóm", "Đang xử lý...", session_path
+                        "Tham gia nhóm", "Thất bại!", session_path
                     )
 
-                    result = await self.join_group(session_path, api_id, api_hash, group_link)
-
-                    if result:
-                        successful_joins += 1
-                        self.update_session_status.emit(
-                            idx, phone_number, full_name, username,
-                            "Tham gia nhóm", "Hoàn Thành!", session_path
-                        )
-                    else:
-                        failed_joins += 1
-                        self.update_session_status.emit(
-                            idx, phone_number, full_name, username,
-                            "Tham gia nhóm", "Thất bại!", session_path
-                        )
-
-                    # Apply delay
-                    if current_join < total_joins_needed and not self.should_stop:
-                        delay = self.get_delay(self.delay_time)
-                        remaining_delay = delay
-                        while remaining_delay > 0 and not self.should_stop:
-                            self.update_message.emit(f"Chờ tham gia tiếp theo... Còn {int(remaining_delay)} giây", "blue")
-                            await asyncio.sleep(1)
-                            remaining_delay -= 1
-
             self.update_message.emit(f"Hoàn tất tham gia nhóm! Thành công: {successful_joins}, Thất bại: {failed_joins}", "green")
+            self.status_buffer.flush()
             self.finished.emit(successful_joins, failed_joins)
         finally:
+            if flush_task:
+                flush_task.cancel()
+            self.status_buffer.flush()
+            await client_pool.aclose()
             self.is_running = False
-
-    @pyqtSlot()
-    def run(self):
-        asyncio.run(self.run_async())
+            self._loop = None
 
     @pyqtSlot()
     def stop(self):
         self.should_stop = True
+        wake_stop_event(self._loop, self._stop_event)
 
 
-# Worker QThread: Seeding Process
+# Worker: Seeding Process
 class SeedingWorker(QObject):
     update_message = pyqtSignal(str, str)
     finished = pyqtSignal(int, int)
     progress = pyqtSignal(int, int)
-    update_session_status = pyqtSignal(int, str, str, str, str, str, str)  # row, phone, full_name, username, message, status, session_path
+    update_session_statuses = pyqtSignal(list)  # [(row, phone, full_name, username, message, status, session_path), ...]
+    delay_started = pyqtSignal(int, str)  # (seconds, message template) - GUI tự đếm ngược
+    delay_finished = pyqtSignal()
+    identity_fetched = pyqtSignal(str, str, str, str)  # session_path, phone, full_name, username
 
     def __init__(self, session_paths, admin_session_path, group_links, scenario_lines, 
-                 delay_time, admin_delay_time, admin_response_lines, random_delay, randomize_message):
+                 delay_time, admin_delay_time, admin_response_lines, random_delay, randomize_message,
+                 identities=None):
         super().__init__()
+        self.status_buffer = SessionStatusBuffer(self.update_session_statuses)
         self.session_paths = session_paths  # List of full session paths
+        self.identities = identities or {}  # Cached (phone, full_name, username) còn mới
         self.admin_session_path = admin_session_path
         self.group_links = group_links
         self.scenario_lines = scenario_lines
-        self.delay_time = delay_time
-        self.admin_delay_time = admin_delay_time
+        self.delay_time = float(delay_time or 0)  # Chuẩn hoá một lần, vòng lặp chỉ dùng số
+        self.admin_delay_time = float(admin_delay_time or 0)
         self.admin_response_lines = admin_response_lines
         self.random_delay = random_delay
+        self._jitter = bool(random_delay)
         self.randomize_message = randomize_message
+        self.client_pool = None
+        self._rng = random.Random(os.urandom(8))  # RNG riêng của worker, không dùng chung random toàn cục
         self.is_running = False
         self.should_stop = False
         self.current_session_index = 0
+        self._loop = None
+        self._stop_event = None
 
-    async def run_session(self, session_path, api_id, api_hash, group_link, message):
-        client = TelegramClient(session_path, api_id, api_hash, connection=ConnectionTcpAbridged)
-        await client.connect()
-
-        if not await client.is_user_authorized():
-            logger.error(f"Session {session_path} không hợp lệ!")
+    async def run_session(self, client, session_path, group_link, message):
+        """Join + send with an already-connected client (None = session die)."""
+        if client is None:
+            logger.error("Session %s không hợp lệ!", session_path)
             return None
 
         try:
             await client(JoinChannelRequest(group_link))
             result = await client.send_message(group_link, message)
-            message_id = result.id
-            logger.info(f"Đã gửi tin nhắn '{message}' tới nhóm {group_link}")
-            await client.disconnect()
-            return message_id
+            logger.info("Đã gửi tin nhắn '%s' tới nhóm %s", message, group_link)
+            return result.id
         except Exception as e:
-            logger.error(f"Không thể gửi tin nhắn tới nhóm {group_link}: {str(e)}")
+            logger.error("Không thể gửi tin nhắn tới nhóm %s: %s", group_link, e)
             return None
 
-    async def run_admin_session(self, session_path, api_id, api_hash, group_link, message):
-        """Admin task - giống tool cũ: mở, gửi, đóng"""
-        client = None
+    async def run_admin_session(self, admin_client, group_link, message):
+        """Admin task - gửi bằng client admin đã kết nối sẵn cho cả lượt chạy"""
         try:
-            client = TelegramClient(session_path, api_id, api_hash)
-            await client.connect()
-
-            if not await client.is_user_authorized():
-                logger.error(f"Session Admin không hợp lệ!")
-                return False
-
             # Ensure admin is in the group
             try:
-                await client(JoinChannelRequest(group_link))
+                await admin_client(JoinChannelRequest(group_link))
             except Exception as join_error:
                 # Might be already in channel
-                logger.info(f"Admin join error (might be already in): {join_error}")
+                logger.info("Admin join error (might be already in): %s", join_error)
             
-            await client.send_message(group_link, message)
-            logger.info(f"Admin đã gửi tin nhắn '{message}' tới nhóm {group_link}")
+            await admin_client.send_message(group_link, message)
+            logger.info("Admin đã gửi tin nhắn '%s' tới nhóm %s", message, group_link)
             return True
         except Exception as e:
-            logger.error(f"Lỗi khi chạy session Admin: {str(e)}")
+            logger.error("Lỗi khi chạy session Admin: %s", e)
             return False
-        finally:
-            if client and client.is_connected():
-                await client.disconnect()
     
-    async def seeding_worker(self, row_index, session_path, group_link, message, api_id, api_hash):
-        """Seeding worker - giống tool cũ: mở, join, gửi, đóng"""
-        client = None
+    async def seeding_worker(self, row_index, session_path, group_link, message):
+        """Seeding worker - một kết nối cho session: mở, join, gửi, đóng"""
         status = {
             "is_live": False,
             "full_name": "Lỗi",
@@ -532,75 +1030,91 @@ class SeedingWorker(QObject):
         }
         
         try:
-            client = TelegramClient(session_path, api_id, api_hash, connection=ConnectionTcpAbridged)
-            await client.connect()
-            
-            if not await client.is_user_authorized():
-                status["status_text"] = "Session die"
-                self.update_session_status.emit(
+            async with self.client_pool.session(session_path, keep=False) as client:
+                if client is None:
+                    status["status_text"] = "Session die"
+                    self.status_buffer.add(
+                        row_index, status["phone"], status["full_name"], status["username"],
+                        "Gửi tin nhắn", status["status_text"], session_path
+                    )
+                    return False
+                
+                # Lấy thông tin user (từ cache nếu còn mới, không thì get_me)
+                status["is_live"] = True
+                identity = self.identities.get(session_path)
+                if identity:
+                    status["phone"], status["full_name"], status["username"] = identity
+                else:
+                    status["phone"], status["full_name"], status["username"] = identity_from_me(await client.get_me())
+                    self.identity_fetched.emit(session_path, status["phone"], status["full_name"], status["username"])
+                
+                # Update UI: Đang xử lý
+                self.status_buffer.add(
                     row_index, status["phone"], status["full_name"], status["username"],
-                    "Gửi tin nhắn", status["status_text"], session_path
+                    "Gửi tin nhắn", "Đang xử lý...", session_path
                 )
-                return False
-            
-            # Lấy thông tin user
-            me = await client.get_me()
-            status["is_live"] = True
-            status["phone"] = me.phone if me.phone else "N/A"
-            status["full_name"] = f"{me.first_name or ''} {me.last_name or ''}".strip() or "N/A"
-            status["username"] = f"@{me.username}" if me.username else ""
-            
-            # Update UI: Đang xử lý
-            self.update_session_status.emit(
-                row_index, status["phone"], status["full_name"], status["username"],
-                "Gửi tin nhắn", "Đang xử lý...", session_path
-            )
-            
-            # Join group
-            try:
-                await client(JoinChannelRequest(group_link))
-            except Exception:
-                pass  # Continue even if join fails
-            
-            # Send message
-            await client.send_message(group_link, message)
-            status["status_text"] = "Đã gửi tin nhắn"
+                
+                # Join group
+                try:
+                    await client(JoinChannelRequest(group_link))
+                except Exception:
+                    pass  # Continue even if join fails
+                
+                # Send message
+                await client.send_message(group_link, message)
+                status["status_text"] = "Đã gửi tin nhắn"
+                
+                # Update UI: Hoàn thành
+                self.status_buffer.add(
+                    row_index, status["phone"], status["full_name"], status["username"],
+                    "Gửi tin nhắn", "Hoàn Thành!", session_path
+                )
+                return True
             
-            # Update UI: Hoàn thành
-            self.update_session_status.emit(
+        except asyncio.CancelledError:
+            # Bị huỷ do người dùng dừng giữa chừng
+            self.status_buffer.add(
                 row_index, status["phone"], status["full_name"], status["username"],
-                "Gửi tin nhắn", "Hoàn Thành!", session_path
+                "Gửi tin nhắn", "Đã dừng", session_path
             )
-            return True
-            
+            raise
         except Exception as e:
             status["status_text"] = str(e)[:50]
             # Update UI: Thất bại
-            self.update_session_status.emit(
+            self.status_buffer.add(
                 row_index, status["phone"], status["full_name"], status["username"],
                 "Gửi tin nhắn", f"Thất bại: {status['status_text']}", session_path
             )
             return False
-        finally:
-            if client and client.is_connected():
-                await client.disconnect()
 
     def get_delay(self, base_delay):
-        if self.random_delay:
-            return random.uniform(base_delay * 0.8, base_delay * 1.2)
-        return base_delay
+        if not self._jitter:
+            return base_delay
+        return base_delay * self._rng.uniform(0.8, 1.2)
+
+    async def _sleep_unless_stopped(self, seconds):
+        """Sleep up to `seconds`, returning early on stop. Returns True if stopped."""
+        return await wait_unless_stopped(self._stop_event, seconds)
 
     def randomize_message_content(self, message):
-        if random.random() < 0.5:
-            message += " " + random.choice(EMOJI_LIST)
-        if random.random() < 0.3:
-            message = message.replace("ạ", "a").replace("A", "a")
+        if self._rng.random() < 0.5:
+            message = f"{message} {_EMOJIS[self._rng.randrange(len(_EMOJIS))]}"
+        if self._rng.random() < 0.3:
+            message = message.translate(_MESSAGE_TRANSLATE)
         return message
 
     async def run_async(self):
         if self.is_running:
             return
         self.is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        if self.should_stop:
+            self._stop_event.set()
+        admin_stack = AsyncExitStack()
+        flush_task = None
+        self.client_pool = SessionClientPool()
+        admin_stack.push_async_callback(self.client_pool.aclose)
 
         try:
             if not self.session_paths:
@@ -618,20 +1132,15 @@ class SeedingWorker(QObject):
                 self.is_running = False
                 return
 
-            # Verify admin session (giống tool cũ)
-            admin_session_path = None
+            # Admin: một kết nối cho cả lượt chạy, đóng khi run_async kết thúc
+            admin_client = None
             if self.admin_session_path:
                 try:
-                    # Verify admin session is valid
-                    test_client = TelegramClient(self.admin_session_path, SCENARIO_API_ID, SCENARIO_API_HASH)
-                    await test_client.connect()
-                    if not await test_client.is_user_authorized():
-                        await test_client.disconnect()
+                    admin_client = await admin_stack.enter_async_context(session_client(self.admin_session_path))
+                    if admin_client is None:
                         self.update_message.emit("Session Admin không hợp lệ!", "red")
                         self.is_running = False
                         return
-                    await test_client.disconnect()
-                    admin_session_path = self.admin_session_path
                     self.update_message.emit("✅ Admin session đã sẵn sàng", "green")
                 except Exception as e:
                     self.update_message.emit(f"Lỗi khi khởi tạo session Admin: {str(e)}", "red")
@@ -640,205 +1149,266 @@ class SeedingWorker(QObject):
 
             # ===== LOGIC GIỐNG 100% TOOL CŨ =====
             self.update_message.emit(f"Đang chạy seeding với {len(self.session_paths)} sessions...", "blue")
-
-            api_id = SCENARIO_API_ID
-            api_hash = SCENARIO_API_HASH
+            flush_task = asyncio.create_task(self.status_buffer.run())
             
-            # Batch theo SỐ GROUPS (giống tool cũ)
+            # Nhịp theo SỐ GROUPS (giống tool cũ): stagger trong đợt, delay giữa các đợt,
+            # admin trả lời sau mỗi đợt - nhưng không còn chờ cả đợt xong mới chạy tiếp
             concurrency = len(self.group_links)
             successful_runs = 0
             failed_runs = 0
             
             # Shuffle sessions
             session_paths_shuffled = self.session_paths.copy()
-            random.shuffle(session_paths_shuffled)
+            self._rng.shuffle(session_paths_shuffled)
+            total_sessions = len(session_paths_shuffled)
             
-            # Cycler for groups and scenarios (giống tool cũ)
-            from itertools import cycle
-            group_cycler = cycle(self.group_links)
-            scenario_cycler = cycle(self.scenario_lines)
-            admin_group_index = 0
+            # Check song song trước: session die báo ngay và không chiếm chỗ trong lịch/đợt
+            dead_paths = await preflight_sessions(session_paths_shuffled, self.identities, self.identity_fetched.emit,
+                                                  self.client_pool)
+            alive = []  # (row_index, session_path)
+            for i, session_path in enumerate(session_paths_shuffled):
+                if session_path in dead_paths:
+                    self.status_buffer.add(i, "N/A", "Lỗi", "", "Gửi tin nhắn", "Session die", session_path)
+                else:
+                    alive.append((i, session_path))
+            failed_runs += len(dead_paths)
+            n_alive = len(alive)
+            if dead_paths:
+                self.progress.emit(len(dead_paths), total_sessions)
+                self.update_message.emit(f"⚠️ {len(dead_paths)} session die - bỏ qua", "red")
             
-            # Chia sessions thành batches (giống tool cũ)
-            total_batches = (len(session_paths_shuffled) + concurrency - 1) // concurrency
+            # Group và kịch bản xoay vòng theo modulo (giống cycle của tool cũ), tính sẵn một lần
+            n_groups = len(self.group_links)
+            n_lines = len(self.scenario_lines)
+            groups = [self.group_links[i % n_groups] for i in range(n_alive)]
+            msgs = [self.scenario_lines[i % n_lines] for i in range(n_alive)]
+            if self.randomize_message:
+                msgs = [self.randomize_message_content(msg) for msg in msgs]
+            admin_round = 0  # Số lần admin đã trả lời - group = group_links[admin_round % n_groups]
             
-            for batch_idx in range(total_batches):
-                if self.should_stop:
-                    break
-                
-                # Lấy batch sessions
-                start_idx = batch_idx * concurrency
-                end_idx = min(start_idx + concurrency, len(session_paths_shuffled))
-                batch_sessions = session_paths_shuffled[start_idx:end_idx]
-                
-                self.progress.emit(end_idx, len(session_paths_shuffled))
-                
-                # Tạo tasks với delay giữa sessions (staggered start - giống tool cũ)
-                async_tasks = []
-                for i, session_path in enumerate(batch_sessions):
-                    if self.should_stop:
-                        break
-                    
-                    # Lấy group và message cho session này
-                    group_link = next(group_cycler)
-                    message = next(scenario_cycler)
-                    if self.randomize_message:
-                        message = self.randomize_message_content(message)
-                    
-                    # Tạo task
-                    task = self.seeding_worker(
-                        start_idx + i, session_path, group_link, message, 
-                        api_id, api_hash
-                    )
-                    async_tasks.append(asyncio.create_task(task))
-                    
-                    # Delay giữa sessions TRONG batch (staggered start)
-                    if self.delay_time > 0 and i < len(batch_sessions) - 1:
-                        delay = self.get_delay(self.delay_time / concurrency)
-                        await asyncio.sleep(delay)
-                
-                # Chờ TẤT CẢ tasks trong batch hoàn thành (giống tool cũ)
-                results = await asyncio.gather(*async_tasks, return_exceptions=True)
-                
-                # Count results
-                for result in results:
-                    if isinstance(result, Exception) or result is False:
-                        failed_runs += 1
-                    else:
-                        successful_runs += 1
-                
-                # Admin logic sau mỗi batch (giống tool cũ)
-                if admin_session_path and not self.should_stop:
-                    admin_target_group = self.group_links[admin_group_index]
-                    admin_response = random.choice(self.admin_response_lines)
-                    
-                    # Admin delay countdown
-                    if self.admin_delay_time > 0:
-                        admin_delay = self.get_delay(self.admin_delay_time)
-                        remaining = int(admin_delay)
-                        while remaining > 0 and not self.should_stop:
-                            self.update_message.emit(f"Admin trả lời sau... {remaining}s", "blue")
-                            await asyncio.sleep(1)
-                            remaining -= 1
-                    
-                    if not self.should_stop:
-                        try:
-                            await self.run_admin_session(
-                                admin_session_path, SCENARIO_API_ID, SCENARIO_API_HASH,
-                                admin_target_group, admin_response
-                            )
-                            self.update_message.emit(f"✅ Admin đã gửi tin nhắn tới {admin_target_group}", "green")
-                            admin_group_index = (admin_group_index + 1) % len(self.group_links)
-                        except Exception as e:
-                            self.update_message.emit(f"❌ Admin gửi thất bại: {str(e)}", "red")
+            # Pool giới hạn số session chạy song song
+            sem = asyncio.Semaphore(SEEDING_MAX_PARALLEL)
+            
+            async def guarded(row_index, session_path, group_link, message, start_at):
+                if await self._sleep_unless_stopped(start_at):
+                    return None  # Đã dừng trước khi tới lượt - không tính kết quả
+                async with sem:
+                    return await self.seeding_worker(row_index, session_path, group_link, message)
+            
+            # Admin chạy song song, được kích hoạt mỗi khi đủ một đợt session hoàn thành
+            admin_event = asyncio.Event()
+            admin_pending = 0
+            seeding_done = False
+            
+            async def admin_loop():
+                nonlocal admin_pending, admin_round
+                while True:
+                    await admin_event.wait()
+                    admin_event.clear()
+                    while admin_pending and not self.should_stop:
+                        admin_pending -= 1
+                        admin_target_group = self.group_links[admin_round % n_groups]
+                        admin_response = self._rng.choice(self.admin_response_lines)
+                        
+                        # Admin delay countdown
+                        if self.admin_delay_time > 0:
+                            admin_delay = self.get_delay(self.admin_delay_time)
+                            self.delay_started.emit(int(admin_delay), "Admin trả lời sau... {}s")
+                            await self._sleep_unless_stopped(admin_delay)
+                            self.delay_finished.emit()
+                        
+                        if not self.should_stop:
+                            try:
+                                await self.run_admin_session(admin_client, admin_target_group, admin_response)
+                                self.update_message.emit(f"✅ Admin đã gửi tin nhắn tới {admin_target_group}", "green")
+                                admin_round += 1
+                            except Exception as e:
+                                self.update_message.emit(f"❌ Admin gửi thất bại: {str(e)}", "red")
+                    if seeding_done or self.should_stop:
+                        return
+            
+            admin_task = asyncio.create_task(admin_loop()) if admin_client else None
+            
+            # Lịch khởi động cho từng session (giây tính từ lúc bắt đầu):
+            # stagger giữa sessions trong đợt, delay đầy đủ sau mỗi đợt
+            start_ats = [0.0] * n_alive
+            if self.delay_time > 0:
+                stagger_delay = self.delay_time / concurrency
+                start_at = 0.0
+                for i in range(n_alive):
+                    start_ats[i] = start_at
+                    start_at += self.get_delay(stagger_delay if (i + 1) % concurrency else self.delay_time)
+            
+            async_tasks = [
+                asyncio.create_task(guarded(*alive[i], groups[i], msgs[i], start_ats[i]))
+                for i in range(n_alive)
+            ]
+            
+            # Dừng: huỷ luôn các session đang chạy/đang chờ thay vì để chúng chạy hết
+            async def cancel_on_stop():
+                await self._stop_event.wait()
+                for task in async_tasks:
+                    task.cancel()
+            
+            stop_watcher = asyncio.create_task(cancel_on_stop())
+            
+            # Cập nhật tiến độ theo từng session hoàn thành, không chờ session chậm nhất trong đợt
+            completed = 0
+            for next_done in asyncio.as_completed(async_tasks):
+                try:
+                    result = await next_done
+                except asyncio.CancelledError:
+                    result = None  # Đã huỷ khi dừng - không tính kết quả
+                except Exception:
+                    result = False
+                if result is None:
+                    continue
+                completed += 1
+                if result is False:
+                    failed_runs += 1
+                else:
+                    successful_runs += 1
+                self.progress.emit(len(dead_paths) + completed, total_sessions)
                 
-                # Delay giữa các batches
-                if batch_idx < total_batches - 1 and not self.should_stop:
-                    delay = self.get_delay(self.delay_time)
-                    remaining_delay = int(delay)
-                    while remaining_delay > 0 and not self.should_stop:
-                        self.update_message.emit(f"Đang chờ đợt tiếp... {remaining_delay}s", "blue")
-                        await asyncio.sleep(1)
-                        remaining_delay -= 1
+                if admin_task and completed % concurrency == 0 and not self.should_stop:
+                    admin_pending += 1
+                    admin_event.set()
+            
+            stop_watcher.cancel()
+            
+            # Đợt cuối chưa đủ số lượng vẫn có admin trả lời (giống tool cũ)
+            if admin_task:
+                if completed % concurrency and not self.should_stop:
+                    admin_pending += 1
+                seeding_done = True
+                admin_event.set()
+                await admin_task
             
             # Kết thúc
+            success_rate = successful_runs / total_sessions * 100 if total_sessions else 0
             self.update_message.emit(
                 f"=============================="
                 f"\n🎉 HOÀN TẤT SEEDING"
-                f"\n✅ Thành công: {successful_runs}/{len(session_paths_shuffled)}"
-                f"\n❌ Thất bại: {failed_runs}/{len(session_paths_shuffled)}"
-                f"\n📊 Tỷ lệ thành công: {successful_runs/len(session_paths_shuffled)*100:.1f}%"
+                f"\n✅ Thành công: {successful_runs}/{total_sessions}"
+                f"\n❌ Thất bại: {failed_runs}/{total_sessions}"
+                f"\n📊 Tỷ lệ thành công: {success_rate:.1f}%"
                 f"\n==============================", 
                 "green"
             )
+            self.status_buffer.flush()
             self.finished.emit(successful_runs, failed_runs)
         finally:
+            if flush_task:
+                flush_task.cancel()
+            self.status_buffer.flush()
+            await admin_stack.aclose()
             self.is_running = False
-
-    @pyqtSlot()
-    def run(self):
-        asyncio.run(self.run_async())
+            self._loop = None
 
     @pyqtSlot()
     def stop(self):
         self.should_stop = True
+        wake_stop_event(self._loop, self._stop_event)
 
 
-# Worker QThread: Check Live Sessions
+# Worker: đọc số điện thoại từ file .session (ngoài thread GUI)
+class PhoneLookupWorker(QObject):
+    phones_ready = pyqtSignal(list)  # [(session_path, phone, mtime), ...]
+    
+    def __init__(self, sessions):
+        super().__init__()
+        self.sessions = sessions  # List of (session_path, session_file, cached_mtime, cached_phone)
+    
+    async def run_async(self):
+        """Stat/read every session on the loop's executor threads and emit the changed ones at once."""
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*(loop.run_in_executor(None, lookup_session_phone, *session)
+                                         for session in self.sessions))
+        found = [result for result in results if result is not None]
+        if found:
+            self.phones_ready.emit(found)
+
+
+# Worker: Check Live Sessions
 class CheckLiveWorker(QObject):
-    update_session_info = pyqtSignal(int, str, str, str, str, str)  # row, phone, full_name, username, status, session_path
+    update_session_infos = pyqtSignal(list)  # [(row, phone, full_name, username, status, session_path), ...]
     finished = pyqtSignal(int, int)  # live_count, die_count
     progress_update = pyqtSignal(int, int)  # current, total
     
     def __init__(self, session_data_list):
         super().__init__()
         self.session_data_list = session_data_list  # List of (row, session_data) tuples
+        self.status_buffer = SessionStatusBuffer(self.update_session_infos)
         self.should_stop = False
     
     def stop(self):
         self.should_stop = True
     
     async def check_single_session(self, row, session_data):
-        """Check a single session."""
+        """Check a single session; returns (row, phone, full_name, username, is_live, status, session_path)."""
         session_path = session_data['session_path']
         
         client = TelegramClient(session_path, SCENARIO_API_ID, SCENARIO_API_HASH, connection=ConnectionTcpAbridged)
         try:
             await client.connect()
-            if await client.is_user_authorized():
-                me = await client.get_me()
-                phone = me.phone if me.phone else "N/A"
-                full_name = f"{me.first_name or ''} {me.last_name or ''}".strip() or "N/A"
-                username = f"@{me.username}" if me.username else ""
-                return row, phone, full_name, username, "✅ Live", session_path
-            else:
-                return row, "N/A", "N/A", "", "❌ Die", session_path
+            # get_me trả None khi session chưa đăng nhập: một round-trip thay vì is_user_authorized + get_me
+            me = await client.get_me()
+            if me is None:
+                return row, "N/A", "N/A", "", False, "❌ Die", session_path
+            phone, full_name, username = identity_from_me(me)
+            return row, phone, full_name, username, True, "✅ Live", session_path
         except Exception as e:
-            return row, "N/A", "N/A", "", f"❌ Die", session_path
+            return row, "N/A", "N/A", "", False, "❌ Die", session_path
         finally:
             await client.disconnect()
     
-    def run(self):
-        """Check all sessions."""
-        import asyncio
-        
+    async def run_async(self):
+        """Check all sessions concurrently (CHECK_LIVE_MAX_PARALLEL at a time), streaming results in 100 ms batches."""
         live_count = 0
         die_count = 0
         total = len(self.session_data_list)
+        sem = asyncio.Semaphore(CHECK_LIVE_MAX_PARALLEL)
         
-        for idx, (row, session_data) in enumerate(self.session_data_list):
-            if self.should_stop:
-                break
-            
-            try:
-                # Create new event loop for each session
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                
-                # Check session
-                row_result, phone, full_name, username, status, session_path = loop.run_until_complete(
-                    self.check_single_session(row, session_data)
-                )
-                
-                loop.close()
+        async def guarded(row, session_data):
+            async with sem:
+                if self.should_stop:
+                    return None
+                try:
+                    return await asyncio.wait_for(self.check_single_session(row, session_data), CHECK_LIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    logger.warning("⏱️ Check session %s quá %ss, tính là Die", session_data.get('session_file', 'unknown'), CHECK_LIVE_TIMEOUT)
+                    return row, "N/A", "N/A", "", False, "❌ Die", session_data['session_path']
+                except Exception as e:
+                    logger.error(f"❌ Lỗi khi check session {session_data.get('session_file', 'unknown')}: {str(e)}")
+                    return row, "N/A", "N/A", "", False, "❌ Die", session_data['session_path']
+        
+        tasks = [asyncio.create_task(guarded(row, session_data)) for row, session_data in self.session_data_list]
+        flush_task = asyncio.create_task(self.status_buffer.run())
+        done = 0
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result is None:
+                    continue  # Đã dừng trước khi tới lượt
+                done += 1
+                row, phone, full_name, username, is_live, status, session_path = result
                 
-                # Emit result
-                self.update_session_info.emit(row_result, phone, full_name, username, status, session_path)
+                # Gom kết quả, gửi sang GUI theo đợt
+                self.status_buffer.add(row, phone, full_name, username, status, session_path)
                 
                 # Update counters
-                if "Live" in status:
+                if is_live:
                     live_count += 1
-                    logger.info(f"✅ Session {idx+1}/{total}: Live - {phone} ({full_name}) {username}" if username else f"✅ Session {idx+1}/{total}: Live - {phone} ({full_name})")
+                    logger.info("✅ Session %d/%d: Live - %s (%s)%s", done, total, phone, full_name, f" {username}" if username else "")
                 else:
                     die_count += 1
-                    logger.info(f"❌ Session {idx+1}/{total}: Die")
+                    logger.info("❌ Session %d/%d: Die", done, total)
                 
                 # Emit progress
-                self.progress_update.emit(idx + 1, total)
-                
-            except Exception as e:
-                logger.error(f"❌ Lỗi khi check session {session_data.get('session_file', 'unknown')}: {str(e)}")
-                die_count += 1
+                self.progress_update.emit(done, total)
+        finally:
+            flush_task.cancel()
+            self.status_buffer.flush()
         
         # Emit finished
         self.finished.emit(live_count, die_count)
@@ -853,20 +1423,51 @@ class TelegramToolWidget(QWidget):
         self.session_folder_path = None
         self.admin_session_path = None
         self.session_data = []
+        self._row_check_items = []  # Item checkbox (cột 0) của từng dòng, song song với session_data
+        self._table_rows = None  # (session_path, group) đang hiển thị, để bỏ qua reload không cần thiết
+        self._row_by_session_path = {}  # session_path -> row trong bảng, cho cập nhật trạng thái từ worker
+        self._text_snapshots = {}  # QTextEdit -> toPlainText() đã copy, xoá khi nội dung đổi
+        self._group_links_cache = {}  # QTextEdit -> link nhóm đã parse, xoá khi nội dung đổi
+        self._text_lines_cache = {}  # QTextEdit -> tuple dòng không rỗng (kịch bản/admin), xoá khi nội dung đổi
+        self._scenario_rng = random.Random(os.urandom(8))  # RNG riêng cho Tạo Kịch Bản, seed một lần
         
         # Cache để lưu trạng thái session (key = session_path, value = dict với phone, username, live, etc.)
         # Load từ file persistent
         self.session_cache = load_session_cache()
         
-        self.seeding_thread = QThread()
-        self.join_group_thread = QThread()
-        self.check_live_thread = QThread()
+        # Một thread asyncio dùng chung cho mọi worker (tạo khi chạy lần đầu)
+        self.async_thread = None
         self.seeding_worker = None
         self.join_group_worker = None
         self.check_live_worker = None
+        self.phone_lookup_worker = None
+        
+        # Đếm ngược delay phía GUI (worker chỉ báo bắt đầu/kết thúc)
+        self.delay_timer = QTimer(self)
+        self.delay_timer.setInterval(1000)
+        self.delay_timer.timeout.connect(self.on_delay_tick)
+        self.delay_remaining = 0
+        self.delay_template = ""
+        
+        # Ghi session cache gom lại: tối đa một lần mỗi 2s trong lúc kết quả đang về
+        self.dirty_cache_paths = set()
+        self.cache_save_timer = QTimer(self)
+        self.cache_save_timer.setSingleShot(True)
+        self.cache_save_timer.setInterval(2000)
+        self.cache_save_timer.timeout.connect(self.flush_session_cache)
+        # Đóng tool khi còn thay đổi chưa ghi (timer chưa kịp chạy) thì ghi nốt
+        QApplication.instance().aboutToQuit.connect(self.flush_session_cache)
+        
+        # Ghi seeding config gom lại: gõ giờ / đổi nhóm liên tục chỉ ghi một lần sau 500ms
+        self.config_save_timer = QTimer(self)
+        self.config_save_timer.setSingleShot(True)
+        self.config_save_timer.setInterval(500)
+        self.config_save_timer.timeout.connect(self.save_config)
+        QApplication.instance().aboutToQuit.connect(self.flush_config)
         
         # Auto scheduler variables
-        self.scheduler_timer = None
+        self.scheduler_timer = None  # Single-shot, hẹn đúng lúc lần chạy tiếp theo
+        self.scheduler_next_run = None
         self.scheduler_enabled = False
         self.last_run_date = None  # Track last run to avoid running multiple times
         
@@ -1025,6 +1626,10 @@ class TelegramToolWidget(QWidget):
         
         self.session_table.setHorizontalHeaderLabels(["", "STT", "SĐT", "Name", "Username", "Message", "Status", "Live"])
         
+        # Checkbox cột 0 là item checkable vẽ bằng delegate (không dùng widget cho từng ô)
+        self.session_check_delegate = SessionCheckDelegate(self.session_table)
+        self.session_table.setItemDelegateForColumn(0, self.session_check_delegate)
+        
         # Hide vertical header (row numbers on the left)
         self.session_table.verticalHeader().setVisible(False)
         
@@ -1055,6 +1660,7 @@ class TelegramToolWidget(QWidget):
         self.group_links_text.setPlaceholderText("https://t.me/...\nhttps://t.me/...")
         self.group_links_text.setMaximumHeight(60)
         self.group_links_text.setStyleSheet(input_style)
+        self.watch_text(self.group_links_text)
         layout.addWidget(self.group_links_text)
         
         # ===== HEADERS ROW (Kịch bản + buttons | Admin + button) =====
@@ -1093,12 +1699,14 @@ class TelegramToolWidget(QWidget):
         self.scenario_text = QTextEdit()
         self.scenario_text.setPlaceholderText("Nhập nội dung...")
         self.scenario_text.setStyleSheet(input_style)
+        self.watch_text(self.scenario_text)
         text_areas_row.addWidget(self.scenario_text, 5)
         
         # Right: Admin response text
         self.admin_response_text = QTextEdit()
         self.admin_response_text.setPlaceholderText("Mỗi dòng một nội dung trả lời...")
         self.admin_response_text.setStyleSheet(input_style)
+        self.watch_text(self.admin_response_text)
         text_areas_row.addWidget(self.admin_response_text, 5)
         
         layout.addLayout(text_areas_row)
@@ -1123,7 +1731,8 @@ class TelegramToolWidget(QWidget):
         self.schedule_time_edit.setPlaceholderText("18:00")
         self.schedule_time_edit.setMaximumWidth(60)
         self.schedule_time_edit.setStyleSheet(input_style)
-        self.schedule_time_edit.textChanged.connect(self.save_config)
+        self.schedule_time_edit.textChanged.connect(lambda: self.config_save_timer.start())
+        self.schedule_time_edit.textChanged.connect(self.on_schedule_time_changed)
         scheduler_box.addWidget(self.schedule_time_edit)
         
         self.schedule_status_label = QLabel("Chưa kích hoạt")
@@ -1146,6 +1755,7 @@ class TelegramToolWidget(QWidget):
         self.group_join_links_text.setPlaceholderText("https://t.me/...\nhttps://t.me/...")
         self.group_join_links_text.setMaximumHeight(150)
         self.group_join_links_text.setStyleSheet(input_style)
+        self.watch_text(self.group_join_links_text)
         layout.addWidget(self.group_join_links_text)
         
         info_label = QLabel("💡 Tip: Nhập link nhóm và nhấn Run để tự động tham gia nhóm bằng tất cả session.")
@@ -1223,13 +1833,14 @@ class TelegramToolWidget(QWidget):
         if ok and group_name:
             # Add sessions from folder to group
             try:
-                session_files = [f for f in os.listdir(folder_path) if f.endswith(".session")]
-                if not session_files:
+                # scandir trả luôn full path + loại file từ lần đọc thư mục, không stat thêm từng file
+                with os.scandir(folder_path) as entries:
+                    session_paths = [entry.path for entry in entries
+                                     if entry.name.endswith(".session") and entry.is_file()]
+                if not session_paths:
                     QMessageBox.warning(self, "Lỗi", "Thư mục không chứa file .session nào!")
                     return
                 
-                # Store full paths
-                session_paths = [os.path.join(folder_path, f) for f in session_files]
                 self.session_groups[group_name] = session_paths
                 
                 # Save session groups to file
@@ -1241,15 +1852,16 @@ class TelegramToolWidget(QWidget):
                 
                 # Save to file (for backward compatibility)
                 self.session_folder_path = folder_path
+                _ensure_dirs()
                 with open(session_folder_path_file, "w", encoding="utf-8") as f:
                     f.write(folder_path)
                 
                 # Reload table
                 self.load_sessions_to_table()
                 
-                logger.info(f"✅ Đã thêm nhóm '{group_name}' với {len(session_files)} sessions")
+                logger.info(f"✅ Đã thêm nhóm '{group_name}' với {len(session_paths)} sessions")
                 QMessageBox.information(self, "Thành công", 
-                    f"Đã thêm {len(session_files)} sessions vào nhóm '{group_name}'!")
+                    f"Đã thêm {len(session_paths)} sessions vào nhóm '{group_name}'!")
                     
             except Exception as e:
                 logger.error(f"❌ Lỗi khi tải session: {str(e)}")
@@ -1334,47 +1946,40 @@ class TelegramToolWidget(QWidget):
     
     def on_header_checkbox_clicked(self, checked):
         """Handle header checkbox click - toggle all session checkboxes."""
-        for row in range(self.session_table.rowCount()):
-            checkbox_widget = self.session_table.cellWidget(row, 0)
-            if checkbox_widget:
-                checkbox = checkbox_widget.findChild(CustomCheckBox)
-                if checkbox:
-                    checkbox.setChecked(checked)
+        self.set_all_checked(checked)
     
     def toggle_all_sessions(self, state):
         """Toggle all session checkboxes (deprecated - kept for compatibility)."""
-        for row in range(self.session_table.rowCount()):
-            checkbox_widget = self.session_table.cellWidget(row, 0)
-            if checkbox_widget:
-                checkbox = checkbox_widget.findChild(CustomCheckBox)
-                if checkbox:
-                    checkbox.setChecked(state == Qt.CheckState.Checked.value)
+        self.set_all_checked(state == Qt.CheckState.Checked.value)
+    
+    def set_all_checked(self, checked):
+        """Set every row's checkbox with a single repaint."""
+        check_state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+        self.session_table.setUpdatesEnabled(False)
+        try:
+            for item in self._row_check_items:
+                item.setCheckState(check_state)
+        finally:
+            self.session_table.setUpdatesEnabled(True)
     
     def get_selected_sessions(self):
         """Get only selected sessions (with checkbox checked)."""
-        selected = []
-        for row in range(self.session_table.rowCount()):
-            checkbox_widget = self.session_table.cellWidget(row, 0)
-            if checkbox_widget:
-                checkbox = checkbox_widget.findChild(CustomCheckBox)
-                if checkbox and checkbox.isChecked() and row < len(self.session_data):
-                    selected.append(self.session_data[row])
-        return selected
+        checked = Qt.CheckState.Checked
+        return [data for item, data in zip(self._row_check_items, self.session_data) if item.checkState() == checked]
     
     def check_live_sessions(self):
-        """Check live status of selected sessions using QThread."""
+        """Check live status of selected sessions on the shared asyncio loop."""
         if not TELETHON_AVAILABLE:
             QMessageBox.warning(self, "Lỗi", "Telethon chưa được cài đặt!")
             return
         
         # Get selected sessions with their row indices
-        session_data_list = []
-        for row in range(self.session_table.rowCount()):
-            checkbox_widget = self.session_table.cellWidget(row, 0)
-            if checkbox_widget:
-                checkbox = checkbox_widget.findChild(CustomCheckBox)
-                if checkbox and checkbox.isChecked() and row < len(self.session_data):
-                    session_data_list.append((row, self.session_data[row]))
+        checked = Qt.CheckState.Checked
+        session_data_list = [
+            (row, data)
+            for row, (item, data) in enumerate(zip(self._row_check_items, self.session_data))
+            if item.checkState() == checked
+        ]
         
         if not session_data_list:
             logger.warning("⚠️ Chưa chọn session nào để check live")
@@ -1388,36 +1993,57 @@ class TelegramToolWidget(QWidget):
         
         # Create worker
         self.check_live_worker = CheckLiveWorker(session_data_list)
-        self.check_live_worker.moveToThread(self.check_live_thread)
         
         # Connect signals
-        self.check_live_thread.started.connect(self.check_live_worker.run)
-        self.check_live_worker.update_session_info.connect(self.on_check_live_update)
+        self.check_live_worker.update_session_infos.connect(self.on_check_live_updates)
         self.check_live_worker.finished.connect(self.on_check_live_finished)
         
-        # Start thread
-        self.check_live_thread.start()
+        # Start on the shared loop
+        self.start_worker(self.check_live_worker)
+    
+    def start_worker(self, worker):
+        """Run worker.run_async() on the shared asyncio thread (started on first use)."""
+        if self.async_thread is None:
+            self.async_thread = AsyncLoopThread()
+            self.async_thread.start()
+        return self.async_thread.submit(worker.run_async())
     
-    def on_check_live_update(self, row, phone, full_name, username, status, session_path):
+    def on_check_live_updates(self, updates):
+        """Apply a batch of check-live results from the worker with table updates suspended."""
+        self.session_table.setUpdatesEnabled(False)
+        try:
+            for update in updates:
+                self.apply_check_live_update(*update)
+        finally:
+            self.session_table.setUpdatesEnabled(True)
+    
+    def set_cell_text(self, row, column, text, centered=False):
+        """Set a cell's text, reusing the existing item instead of allocating a new one."""
+        item = self.session_table.item(row, column)
+        if item is None:
+            item = QTableWidgetItem(text)
+            if centered:
+                item.setTextAlignment(_ALIGN_CENTER)
+            self.session_table.setItem(row, column, item)
+        elif item.text() != text:
+            item.setText(text)
+    
+    def apply_check_live_update(self, row, phone, full_name, username, status, session_path):
         """Update UI when a session is checked - với full_name."""
         # Update phone number (column 2)
         if phone and phone != "N/A":
-            phone_item = QTableWidgetItem(phone)
-            phone_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.session_table.setItem(row, 2, phone_item)
+            self.set_cell_text(row, 2, phone, centered=True)
         
         # Update full name (column 3 - Name column)
         if full_name and full_name != "N/A":
-            self.session_table.setItem(row, 3, QTableWidgetItem(full_name))
+            self.set_cell_text(row, 3, full_name)
         
         # Update username (column 4 - Username column)
         if username:
-            self.session_table.setItem(row, 4, QTableWidgetItem(username))
+            self.set_cell_text(row, 4, username)
         
         # Update Live status - centered (column 7)
-        live_item = QTableWidgetItem(status)
-        live_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.session_table.setItem(row, 7, live_item)
+        self.set_cell_text(row, 7, status, centered=True)
         
         # Update persistent cache
         if session_path:
@@ -1429,22 +2055,28 @@ class TelegramToolWidget(QWidget):
                 'username': username,
                 'live_status': status
             })
+            if status == "✅ Live":
+                self.session_cache[session_path]['updated_at'] = time.time()
             
-            # Save cache to file
-            save_session_cache(self.session_cache)
-        
-        # Update session_data cache
-        if row < len(self.session_data):
-            self.session_data[row].update({
-                'phone': phone,
-                'full_name': full_name,
-                'username': username
-            })
+            # Persist later together with the other rows of this check
+            self.mark_session_cache_dirty(session_path)
+    
+    def mark_session_cache_dirty(self, session_path):
+        """Schedule a cache write for this session (coalesced by cache_save_timer)."""
+        self.dirty_cache_paths.add(session_path)
+        if not self.cache_save_timer.isActive():
+            self.cache_save_timer.start()
+    
+    def flush_session_cache(self):
+        """Write all pending session cache rows in one transaction."""
+        self.cache_save_timer.stop()
+        if self.dirty_cache_paths:
+            save_session_cache(self.session_cache, self.dirty_cache_paths)
+            self.dirty_cache_paths = set()
     
     def on_check_live_finished(self, live_count, die_count):
         """Handle check live completion."""
-        self.check_live_thread.quit()
-        
+        self.flush_session_cache()
         total = live_count + die_count
         rate = (live_count / total * 100) if total > 0 else 0
         
@@ -1458,53 +2090,21 @@ class TelegramToolWidget(QWidget):
         QMessageBox.information(self, "Hoàn tất", 
             f"Check Live hoàn tất!\n\n✅ Live: {live_count}\n❌ Die: {die_count}\n📊 Tỷ lệ: {rate:.1f}%")
     
-    def extract_phone_from_session(self, session_path, session_file):
-        """
-        Extract phone number from session file.
-        Try multiple methods:
-        1. Read from .session SQLite database
-        2. Parse from filename if it contains phone number
-        3. Return filename as fallback
-        """
-        # Method 1: Try to read from .session database
-        if TELETHON_AVAILABLE:
-            try:
-                conn = sqlite3.connect(session_path)
-                cursor = conn.cursor()
-                # Telethon stores DC info in sessions table
-                cursor.execute("SELECT * FROM sessions")
-                row = cursor.fetchone()
-                conn.close()
-                
-                # If we have data, try to extract phone from the session
-                # This is a simplified approach - full parsing would need telethon's internal format
-                if row:
-                    # Try to find phone in session data using regex
-                    session_str = str(row)
-                    phone_match = re.search(r'\+?\d{10,15}', session_str)
-                    if phone_match:
-                        return phone_match.group(0)
-            except Exception:
-                pass
-        
-        # Method 2: Try to parse from filename
-        # Remove .session extension
-        name_without_ext = session_file.replace('.session', '')
-        
-        # Check if filename is or contains a phone number
-        # Pattern: numbers, possibly with + at start
-        phone_pattern = r'\+?\d{10,15}'
-        phone_match = re.search(phone_pattern, name_without_ext)
-        if phone_match:
-            return phone_match.group(0)
-        
-        # Method 3: Fallback - return filename without extension
-        return name_without_ext
+    def on_phones_ready(self, results):
+        """Store phones read from .session files and show them for rows without a Telegram phone."""
+        for session_path, phone, mtime in results:
+            entry = self.session_cache.setdefault(session_path, {})
+            entry.update({'file_phone': phone, 'file_mtime': mtime})
+            self.mark_session_cache_dirty(session_path)
+            
+            row = self._row_by_session_path.get(session_path)
+            if row is not None and not entry.get('phone'):
+                self.set_cell_text(row, 2, phone, centered=True)
     
     def on_group_changed(self):
         """Handle group selection change - load sessions and save config."""
         self.load_sessions_to_table()
-        self.save_config()  # Auto save selected group
+        self.config_save_timer.start()  # Auto save selected group
     
     def load_sessions_to_table(self):
         """Load sessions to table based on selected group."""
@@ -1521,6 +2121,9 @@ class TelegramToolWidget(QWidget):
             # Show sessions from selected group only
             if selected_group not in self.session_groups:
                 self.session_table.setRowCount(0)
+                self.session_data = []
+                self._row_check_items = []
+                self.set_table_rows([])
                 logger.warning(f"⚠️ Nhóm '{selected_group}' không tồn tại")
                 return  # Return chỉ khi nhóm KHÔNG tồn tại
             all_sessions = [(p, os.path.basename(p), selected_group) for p in self.session_groups[selected_group]]
@@ -1529,70 +2132,115 @@ class TelegramToolWidget(QWidget):
         # Sort sessions by filename to maintain consistent order
         all_sessions.sort(key=lambda x: x[1].lower())
         
+        new_rows = [(path, group_name) for path, _, group_name in all_sessions]
+        if new_rows == self._table_rows:
+            return  # Bảng đã đúng (vd. combo đổi nhóm rồi lại gọi reload lần nữa)
+        if self._table_rows and self.remove_table_rows(new_rows):
+            return
+        
+        self.set_table_rows(None)
+        # Tạm tắt repaint/sort/signal của bảng khi đổ dữ liệu, bật lại một lần ở cuối
+        sorting_enabled = self.session_table.isSortingEnabled()
+        self.session_table.setSortingEnabled(False)
+        self.session_table.setUpdatesEnabled(False)
+        self.session_table.blockSignals(True)
         try:
+            # Các dòng đã có giữ lại item và chỉ đổi nội dung; chỉ dòng mới mới tạo item
             self.session_table.setRowCount(len(all_sessions))
             self.session_data = []
+            phone_lookups = []
+            self._row_check_items = []
             
             for i, (session_path, session_file, group_name) in enumerate(all_sessions):
                 # Check if session has cached data
                 cached_data = self.session_cache.get(session_path, {})
                 
-                # Extract phone from cache or session filename
-                phone_number = cached_data.get('phone') or self.extract_phone_from_session(session_path, session_file)
+                # Phone từ cache (Telegram > file .session) hoặc tên file; file .session đọc ở nền
+                phone_number = cached_data.get('phone') or cached_data.get('file_phone') or filename_phone(session_file)
+                if not cached_data.get('phone') and not _PHONE_RE.search(session_file):  # Tên file có số thì không cần đọc file
+                    phone_lookups.append((session_path, session_file,
+                                          cached_data.get('file_mtime'), cached_data.get('file_phone')))
                 full_name = cached_data.get('full_name', "")
                 username = cached_data.get('username', "")
                 live_status = cached_data.get('live_status', "Chưa check")
                 
+                # Phone/name/username nằm ở ô bảng + session_cache, không nhân bản vào từng dict
                 self.session_data.append({
-                    "phone": phone_number,
-                    "full_name": full_name,
-                    "username": username,
                     "session_file": session_file,
                     "session_path": session_path,
                     "group": group_name
                 })
                 
-                # Add checkbox to column 0 - compact layout
-                checkbox = CustomCheckBox()
-                checkbox.setChecked(False)  # Default unchecked
-                checkbox.setFixedSize(18, 18)  # Fix size để không có khoảng trống
-                checkbox_widget = QWidget()
-                checkbox_layout = QHBoxLayout(checkbox_widget)
-                checkbox_layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                checkbox_layout.setContentsMargins(0, 0, 0, 0)
-                checkbox_layout.setSpacing(0)
-                checkbox_layout.addWidget(checkbox)
-                self.session_table.setCellWidget(i, 0, checkbox_widget)
+                # Add checkbox to column 0 - checkable item, vẽ bởi SessionCheckDelegate
+                check_item = self.session_table.item(i, 0)
+                if check_item is None:
+                    check_item = QTableWidgetItem()
+                    check_item.setFlags(Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable)
+                    self.session_table.setItem(i, 0, check_item)
+                check_item.setCheckState(Qt.CheckState.Unchecked)  # Default unchecked
+                self._row_check_items.append(check_item)
                 
                 # Add STT (số thứ tự) to column 1 - centered
-                stt_item = QTableWidgetItem(str(i + 1))
-                stt_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.session_table.setItem(i, 1, stt_item)
+                self.set_cell_text(i, 1, str(i + 1), centered=True)
                 
                 # Add other columns (shift by 1)
                 # SĐT - centered (restore from cache)
-                phone_item = QTableWidgetItem(phone_number)
-                phone_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.session_table.setItem(i, 2, phone_item)
+                self.set_cell_text(i, 2, phone_number, centered=True)
                 
                 # Name - Full Name (restore from cache)
-                self.session_table.setItem(i, 3, QTableWidgetItem(full_name if full_name else ""))
+                self.set_cell_text(i, 3, full_name if full_name else "")
                 
                 # Username - @username (restore from cache)
-                self.session_table.setItem(i, 4, QTableWidgetItem(username if username else ""))
+                self.set_cell_text(i, 4, username if username else "")
                 
                 # Message
-                self.session_table.setItem(i, 5, QTableWidgetItem("Chưa chạy"))
+                self.set_cell_text(i, 5, "Chưa chạy")
                 
                 # Status - empty (chỉ hiển thị khi chạy)
-                self.session_table.setItem(i, 6, QTableWidgetItem(""))
+                self.set_cell_text(i, 6, "")
                 
                 # Live status - centered (restore from cache)
-                live_item = QTableWidgetItem(live_status)
-                live_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.session_table.setItem(i, 7, live_item)
+                self.set_cell_text(i, 7, live_status, centered=True)
+            self.set_table_rows(new_rows)
+            if phone_lookups:
+                self.phone_lookup_worker = PhoneLookupWorker(phone_lookups)
+                self.phone_lookup_worker.phones_ready.connect(self.on_phones_ready)
+                self.start_worker(self.phone_lookup_worker)
         except Exception as e:
             logger.error(f"❌ Lỗi khi tải session: {str(e)}")
+        finally:
+            self.session_table.blockSignals(False)
+            self.session_table.setUpdatesEnabled(True)
+            self.session_table.setSortingEnabled(sorting_enabled)
+    
+    def set_table_rows(self, rows):
+        """Record the (session_path, group) rows shown in the table and index them by path."""
+        self._table_rows = rows
+        self._row_by_session_path = {path: i for i, (path, _) in enumerate(rows or ())}
+    
+    def remove_table_rows(self, new_rows):
+        """Drop rows missing from new_rows in place if the table only shrank; returns False when a full reload is needed."""
+        keep = set(new_rows)
+        if [row for row in self._table_rows if row in keep] != new_rows:
+            return False
+        
+        self.session_table.setUpdatesEnabled(False)
+        try:
+            for i in range(len(self._table_rows) - 1, -1, -1):
+                if self._table_rows[i] not in keep:
+                    self.session_table.removeRow(i)
+                    del self.session_data[i]
+                    del self._row_check_items[i]
+            self.set_table_rows(new_rows)
+            
+            # Đánh lại STT
+            for i in range(len(new_rows)):
+                stt_item = self.session_table.item(i, 1)
+                if stt_item:
+                    stt_item.setText(str(i + 1))
+        finally:
+            self.session_table.setUpdatesEnabled(True)
+        return True
     
     def select_admin_session(self):
         """Select admin session file."""
@@ -1600,6 +2248,7 @@ class TelegramToolWidget(QWidget):
         if file_path:
             self.admin_session_path = file_path
             try:
+                _ensure_dirs()
                 with open(admin_session_file_path, "w", encoding="utf-8") as f:
                     f.write(file_path)
                 logger.info(f"👤 Đã chọn Admin session: {os.path.basename(file_path)}")
@@ -1609,38 +2258,44 @@ class TelegramToolWidget(QWidget):
                 logger.error(f"❌ Lỗi khi lưu admin session path: {str(e)}")
     
     def load_config(self):
-        # Load session groups
-        self.session_groups = load_session_groups()
+        # 3 file text đọc song song (chờ disk = file chậm nhất thay vì tổng), trong lúc đọc state DB
+        with ThreadPoolExecutor(max_workers=3, thread_name_prefix="tg-config") as pool:
+            folder_future, admin_session_future, admin_responses_future = (
+                pool.submit(read_text_file, path)
+                for path in (session_folder_path_file, admin_session_file_path, admin_responses_file)
+            )
+            
+            # Load session groups
+            self.session_groups = load_session_groups()
         for group_name in self.session_groups.keys():
             if self.session_group_combo.findText(group_name) == -1:
                 self.session_group_combo.addItem(group_name)
         
         # Load session folder path (for backward compatibility)
-        if os.path.exists(session_folder_path_file):
-            try:
-                with open(session_folder_path_file, "r", encoding="utf-8") as f:
-                    self.session_folder_path = f.read().strip()
-                # Note: No auto-load to table - user must manually add via Session menu
-            except Exception as e:
-                logger.error(f"Lỗi khi đọc session folder path: {str(e)}")
+        try:
+            folder_path = folder_future.result()
+            if folder_path is not None:
+                self.session_folder_path = folder_path
+            # Note: No auto-load to table - user must manually add via Session menu
+        except Exception as e:
+            logger.error(f"Lỗi khi đọc session folder path: {str(e)}")
         
         # Load admin session path
-        if os.path.exists(admin_session_file_path):
-            try:
-                with open(admin_session_file_path, "r", encoding="utf-8") as f:
-                    self.admin_session_path = f.read().strip()
-            except Exception as e:
-                logger.error(f"Lỗi khi đọc admin session path: {str(e)}")
+        try:
+            admin_session_path = admin_session_future.result()
+            if admin_session_path is not None:
+                self.admin_session_path = admin_session_path
+        except Exception as e:
+            logger.error(f"Lỗi khi đọc admin session path: {str(e)}")
         
         # Load admin responses
-        if os.path.exists(admin_responses_file):
-            try:
-                with open(admin_responses_file, "r", encoding="utf-8") as f:
-                    self.admin_response_text.setPlainText(f.read().strip())
-            except:
-                pass
-        else:
-            self.admin_response_text.setPlainText("\n".join(DEFAULT_ADMIN_RESPONSES))
+        try:
+            responses = admin_responses_future.result()
+            if responses is None:
+                responses = "\n".join(DEFAULT_ADMIN_RESPONSES)
+            self.admin_response_text.setPlainText(responses)
+        except:
+            pass
         
         # Load seeding config
         config = load_seeding_config()
@@ -1670,20 +2325,55 @@ class TelegramToolWidget(QWidget):
             self.load_sessions_to_table()
             logger.info(f"📱 Đã load {len(self.session_groups)} nhóm session")
     
+    def watch_text(self, text_edit):
+        """Drop the cached text/links of a text box whenever its content changes."""
+        def invalidate():
+            self._text_snapshots.pop(text_edit, None)
+            self._group_links_cache.pop(text_edit, None)
+            self._text_lines_cache.pop(text_edit, None)
+        text_edit.textChanged.connect(invalidate)
+    
+    def text_of(self, text_edit):
+        """toPlainText() of a text box, copied out of the document only once per edit."""
+        text = self._text_snapshots.get(text_edit)
+        if text is None:
+            text = self._text_snapshots[text_edit] = text_edit.toPlainText()
+        return text
+    
+    def group_links_from(self, text_edit):
+        """Parsed group links of a link box, re-parsed only after its text changes."""
+        links = self._group_links_cache.get(text_edit)
+        if links is None:
+            links = self._group_links_cache[text_edit] = parse_group_links(self.text_of(text_edit))
+        return links
+    
+    def lines_from(self, text_edit):
+        """Non-empty lines of a text box as a tuple, re-parsed only after its text changes."""
+        lines = self._text_lines_cache.get(text_edit)
+        if lines is None:
+            lines = self._text_lines_cache[text_edit] = tuple(non_empty_lines(self.text_of(text_edit)))
+        return lines
+    
+    def flush_config(self):
+        """Write the seeding config now if a debounced save is still pending."""
+        if self.config_save_timer.isActive():
+            self.save_config()
+    
     def save_config(self):
-        group_links = [line.strip() for line in self.group_links_text.toPlainText().split("\n") if line.strip() and line.startswith("https://t.me/")]
-        scenario_text = self.scenario_text.toPlainText()
-        group_join_links = self.group_join_links_text.toPlainText()
+        self.config_save_timer.stop()
+        group_links = self.group_links_from(self.group_links_text)
+        scenario_text = self.text_of(self.scenario_text)
+        group_join_links = self.text_of(self.group_join_links_text)
         selected_group = self.session_group_combo.currentText()
         save_seeding_config(group_links, self.delay_time_line.text(), self.admin_delay_time_line.text(), 
                            self.random_delay_checkbox.isChecked(), scenario_text, group_join_links,
                            self.auto_schedule_checkbox.isChecked(), self.schedule_time_edit.text().strip(), selected_group)
     
     def save_admin_responses(self):
-        responses = self.admin_response_text.toPlainText().strip()
+        responses = self.text_of(self.admin_response_text).strip()
         if responses:
             save_admin_responses(responses)
-            num_responses = len([line for line in responses.split("\n") if line.strip()])
+            num_responses = len(non_empty_lines(responses))
             logger.info(f"💾 Đã lưu {num_responses} nội dung Admin response")
             QMessageBox.information(self, "Thành công", "Đã lưu nội dung Admin!")
         else:
@@ -1692,30 +2382,30 @@ class TelegramToolWidget(QWidget):
     
     def generate_scenario(self):
         try:
-            if os.path.exists(sample_script_file):
-                with open(sample_script_file, "r", encoding="utf-8") as f:
-                    lines = [line.strip() for line in f.readlines() if line.strip()]
-                if lines:
-                    random.shuffle(lines)
-                    self.scenario_text.setPlainText("\n".join(lines))
-                    logger.info(f"🎲 Đã tạo kịch bản ngẫu nhiên với {len(lines)} dòng")
-                else:
-                    logger.warning("⚠️ File sample_script.txt trống!")
-                    self.status_label.setText("File sample_script.txt trống!")
+            with open(sample_script_file, "r", encoding="utf-8") as f:
+                lines = non_empty_lines(f.read())
+            if lines:
+                self._scenario_rng.shuffle(lines)
+                self.scenario_text.setPlainText("\n".join(lines))
+                logger.info(f"🎲 Đã tạo kịch bản ngẫu nhiên với {len(lines)} dòng")
             else:
-                logger.warning("⚠️ Không tìm thấy file sample_script.txt!")
-                self.status_label.setText("Không tìm thấy file sample_script.txt!")
+                logger.warning("⚠️ File sample_script.txt trống!")
+                self.status_label.setText("File sample_script.txt trống!")
+        except FileNotFoundError:
+            logger.warning("⚠️ Không tìm thấy file sample_script.txt!")
+            self.status_label.setText("Không tìm thấy file sample_script.txt!")
         except Exception as e:
             logger.error(f"❌ Lỗi khi tạo kịch bản: {str(e)}")
             self.status_label.setText(f"Lỗi: {str(e)}")
     
     def save_scenario(self):
-        content = self.scenario_text.toPlainText().strip()
+        content = self.text_of(self.scenario_text).strip()
         if content:
             try:
+                _ensure_dirs()
                 with open(sample_script_file, "w", encoding="utf-8") as f:
                     f.write(content)
-                num_lines = len([line for line in content.split("\n") if line.strip()])
+                num_lines = len(non_empty_lines(content))
                 logger.info(f"💾 Đã lưu kịch bản mẫu với {num_lines} dòng")
                 QMessageBox.information(self, "Thành công", "Đã lưu kịch bản!")
             except Exception as e:
@@ -1738,8 +2428,7 @@ class TelegramToolWidget(QWidget):
             return
         
         # Use group_join_links_text from Group tab
-        group_links = [line.strip() for line in self.group_join_links_text.toPlainText().split("\n") 
-                      if line.strip() and line.startswith("https://t.me/")]
+        group_links = self.group_links_from(self.group_join_links_text)
         if not group_links:
             self.status_label.setText("❌ Danh sách link nhóm trống!")
             logger.warning("❌ Danh sách link nhóm trống")
@@ -1766,13 +2455,15 @@ class TelegramToolWidget(QWidget):
         logger.info("=" * 30)
         
         self.join_group_worker = JoinGroupWorker(selected_session_paths, group_links, delay_time, 
-                                                  self.random_delay_checkbox.isChecked())
-        self.join_group_worker.moveToThread(self.join_group_thread)
-        self.join_group_thread.started.connect(self.join_group_worker.run)
+                                                  self.random_delay_checkbox.isChecked(),
+                                                  fresh_session_identities(self.session_cache, selected_session_paths))
         self.join_group_worker.update_message.connect(self.show_message)
         self.join_group_worker.finished.connect(self.on_join_finished)
-        self.join_group_worker.update_session_status.connect(self.update_session_status)
-        self.join_group_thread.start()
+        self.join_group_worker.update_session_statuses.connect(self.update_session_statuses)
+        self.join_group_worker.delay_started.connect(self.on_delay_started)
+        self.join_group_worker.delay_finished.connect(self.delay_timer.stop)
+        self.join_group_worker.identity_fetched.connect(self.on_identity_fetched)
+        self.start_worker(self.join_group_worker)
         
         # Update button state
         self.is_running = True
@@ -1791,20 +2482,19 @@ class TelegramToolWidget(QWidget):
             logger.warning("❌ Không có session nào được chọn để chạy")
             return
         
-        group_links = [line.strip() for line in self.group_links_text.toPlainText().split("\n") 
-                      if line.strip() and line.startswith("https://t.me/")]
+        group_links = self.group_links_from(self.group_links_text)
         if not group_links:
             self.status_label.setText("❌ Danh sách link nhóm trống!")
             logger.warning("❌ Danh sách link nhóm trống")
             return
         
-        scenario_lines = [line.strip() for line in self.scenario_text.toPlainText().split("\n") if line.strip()]
+        scenario_lines = self.lines_from(self.scenario_text)
         if not scenario_lines:
             self.status_label.setText("❌ Kịch bản trống!")
             logger.warning("❌ Kịch bản trống")
             return
         
-        admin_lines = [line.strip() for line in self.admin_response_text.toPlainText().split("\n") if line.strip()] or DEFAULT_ADMIN_RESPONSES
+        admin_lines = self.lines_from(self.admin_response_text) or DEFAULT_ADMIN_RESPONSES
         
         try:
             delay_time = float(self.delay_time_line.text().strip())
@@ -1831,14 +2521,16 @@ class TelegramToolWidget(QWidget):
             selected_session_paths, self.admin_session_path, group_links, scenario_lines,
             delay_time, admin_delay_time, admin_lines, 
             self.random_delay_checkbox.isChecked(), 
-            self.randomize_message_checkbox.isChecked()
+            self.randomize_message_checkbox.isChecked(),
+            fresh_session_identities(self.session_cache, selected_session_paths)
         )
-        self.seeding_worker.moveToThread(self.seeding_thread)
-        self.seeding_thread.started.connect(self.seeding_worker.run)
         self.seeding_worker.update_message.connect(self.show_message)
         self.seeding_worker.finished.connect(self.on_seeding_finished)
-        self.seeding_worker.update_session_status.connect(self.update_session_status)
-        self.seeding_thread.start()
+        self.seeding_worker.update_session_statuses.connect(self.update_session_statuses)
+        self.seeding_worker.delay_started.connect(self.on_delay_started)
+        self.seeding_worker.delay_finished.connect(self.delay_timer.stop)
+        self.seeding_worker.identity_fetched.connect(self.on_identity_fetched)
+        self.start_worker(self.seeding_worker)
         
         # Update button state
         self.is_running = True
@@ -1854,11 +2546,46 @@ class TelegramToolWidget(QWidget):
         else:
             self.status_label.setStyleSheet("")
     
+    def on_delay_started(self, seconds, template):
+        self.delay_remaining = seconds
+        self.delay_template = template
+        self.show_message(template.format(seconds), "blue")
+        self.delay_timer.start()
+    
+    def on_delay_tick(self):
+        self.delay_remaining -= 1
+        if self.delay_remaining <= 0:
+            self.delay_timer.stop()
+            return
+        self.show_message(self.delay_template.format(self.delay_remaining), "blue")
+    
+    def on_identity_fetched(self, session_path, phone, full_name, username):
+        """Worker vừa get_me xong - lưu kèm thời điểm để lần chạy sau dùng lại."""
+        self.session_cache.setdefault(session_path, {}).update({
+            'phone': phone,
+            'full_name': full_name,
+            'username': username,
+            'updated_at': time.time()
+        })
+        self.mark_session_cache_dirty(session_path)
+    
+    def update_session_statuses(self, statuses):
+        """
+        Apply a batch of worker status updates; the touched sessions are persisted by the cache timer.
+        The table row is looked up by session_path (the worker's index is into its own session list).
+        """
+        row_by_path = self._row_by_session_path
+        self.session_table.setUpdatesEnabled(False)
+        try:
+            for _, *fields, session_path in statuses:
+                row = row_by_path.get(session_path)
+                if row is not None:  # Bỏ qua session không còn trong bảng
+                    self.update_session_status(row, *fields, session_path)
+        finally:
+            self.session_table.setUpdatesEnabled(True)
+    
     def update_session_status(self, row, phone, full_name, username, message, status, session_path):
-        """Update session status in UI - CORRECT column mapping."""
-        if row >= self.session_table.rowCount():
-            return  # Row không tồn tại
-        
+        """Update session status in UI - CORRECT column mapping. row must be a current table row."""
         # Lưu vào cache
         if session_path not in self.session_cache:
             self.session_cache[session_path] = {}
@@ -1868,33 +2595,32 @@ class TelegramToolWidget(QWidget):
             'username': username
         })
         
-        # Save cache to file
-        save_session_cache(self.session_cache)
+        # Persist this session's row with the next cache flush
+        self.mark_session_cache_dirty(session_path)
         
         # Update UI - ĐÚNG mapping các cột
         # Col 0: Checkbox (không update)
         # Col 1: STT (không update)
         # Col 2: SĐT
-        phone_item = QTableWidgetItem(phone)
-        phone_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.session_table.setItem(row, 2, phone_item)
+        self.set_cell_text(row, 2, phone, centered=True)
         
         # Col 3: Name (Full Name từ Telegram)
-        self.session_table.setItem(row, 3, QTableWidgetItem(full_name))
+        self.set_cell_text(row, 3, full_name)
         
         # Col 4: Username (@username từ Telegram)
-        self.session_table.setItem(row, 4, QTableWidgetItem(username))
+        self.set_cell_text(row, 4, username)
         
         # Col 5: Message (hành động: Tham gia nhóm, Gửi tin nhắn)
-        self.session_table.setItem(row, 5, QTableWidgetItem(message))
+        self.set_cell_text(row, 5, message)
         
         # Col 6: Status (trạng thái: Đang xử lý, Hoàn Thành, Thất bại)
-        self.session_table.setItem(row, 6, QTableWidgetItem(status))
+        self.set_cell_text(row, 6, status)
         
         # Col 7: Live (KHÔNG update - giữ nguyên trạng thái check live)
     
     def on_join_finished(self, success, failed):
-        self.join_group_thread.quit()
+        self.delay_timer.stop()
+        self.flush_session_cache()
         total = success + failed
         rate = (success / total * 100) if total > 0 else 0
         self.status_label.setText(f"✅ Hoàn tất tham gia! Thành công: {success}, Thất bại: {failed}, Tỷ lệ: {rate:.1f}%")
@@ -1912,7 +2638,8 @@ class TelegramToolWidget(QWidget):
         self.run_stop_btn.setStyleSheet("")
     
     def on_seeding_finished(self, success, failed):
-        self.seeding_thread.quit()
+        self.delay_timer.stop()
+        self.flush_session_cache()
         total = success + failed
         rate = (success / total * 100) if total > 0 else 0
         self.status_label.setText(f"✅ Hoàn tất seeding! Thành công: {success}, Thất bại: {failed}, Tỷ lệ: {rate:.1f}%")
@@ -1952,12 +2679,8 @@ class TelegramToolWidget(QWidget):
                 self.auto_schedule_checkbox.setChecked(False)
                 return
             
-            # Start timer - check every 60 seconds
-            if self.scheduler_timer is None:
-                self.scheduler_timer = QTimer(self)
-                self.scheduler_timer.timeout.connect(self.check_schedule)
-            
-            self.scheduler_timer.start(60000)  # 60 seconds
+            # Hẹn một lần đúng giờ chạy, không poll mỗi phút
+            self.schedule_next_run(hour, minute)
             self.schedule_status_label.setText(f"✅ Kích hoạt - Chạy lúc {schedule_time}")
             self.schedule_status_label.setStyleSheet("color: #00ff00;")
             logger.info(f"⏰ Lịch tự động đã BẬT - Sẽ chạy lúc {schedule_time} mỗi ngày")
@@ -1976,38 +2699,52 @@ class TelegramToolWidget(QWidget):
             # Save config
             self.save_config()
     
-    def check_schedule(self):
-        """Check if it's time to run auto seeding."""
+    def schedule_next_run(self, hour, minute):
+        """Arm the single-shot scheduler timer for the next HH:MM that has not run yet."""
+        now = datetime.now()
+        target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if target <= now or self.last_run_date == target.strftime('%Y-%m-%d'):
+            target += timedelta(days=1)
+        
+        if self.scheduler_timer is None:
+            self.scheduler_timer = QTimer(self)
+            self.scheduler_timer.setSingleShot(True)
+            self.scheduler_timer.setTimerType(Qt.TimerType.PreciseTimer)  # Coarse timer lệch tới 5% với khoảng dài
+            self.scheduler_timer.timeout.connect(self.check_schedule)
+        self.scheduler_next_run = target
+        self.scheduler_timer.start(int((target - now).total_seconds() * 1000))
+    
+    def on_schedule_time_changed(self, text):
+        """Re-arm the scheduler when the run time is edited while it is enabled."""
         if not self.scheduler_enabled:
             return
-        
-        schedule_time = self.schedule_time_edit.text().strip()
-        if not schedule_time or ':' not in schedule_time:
-            return
-        
         try:
-            hour, minute = schedule_time.split(':')
-            hour = int(hour)
-            minute = int(minute)
-        except:
+            hour, minute = (int(part) for part in text.strip().split(':'))
+        except ValueError:
+            return
+        if 0 <= hour < 24 and 0 <= minute < 60:
+            self.schedule_next_run(hour, minute)
+    
+    def check_schedule(self):
+        """Scheduler timer fired: run auto seeding if the target time has been reached."""
+        if not self.scheduler_enabled or self.scheduler_next_run is None:
             return
         
+        target = self.scheduler_next_run
         now = datetime.now()
-        current_date = now.strftime('%Y-%m-%d')
+        if now < target:
+            # Timer dậy sớm (đồng hồ hệ thống bị chỉnh / máy sleep) - hẹn lại phần còn lại
+            self.scheduler_timer.start(int((target - now).total_seconds() * 1000) + 1)
+            return
         
-        # Check if current time matches schedule time
-        if now.hour == hour and now.minute == minute:
-            # Avoid running multiple times in the same minute
-            if self.last_run_date == current_date:
-                return
-            
-            logger.info("=" * 30)
-            logger.info("⏰ ĐẾN GIỜ CHẠY LỊCH TỰ ĐỘNG!")
-            logger.info(f"⏰ Thời gian: {now.strftime('%Y-%m-%d %H:%M:%S')}")
-            logger.info("=" * 30)
-            
-            self.last_run_date = current_date
-            self.run_auto_seeding()
+        logger.info("=" * 30)
+        logger.info("⏰ ĐẾN GIỜ CHẠY LỊCH TỰ ĐỘNG!")
+        logger.info(f"⏰ Thời gian: {now.strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("=" * 30)
+        
+        self.last_run_date = target.strftime('%Y-%m-%d')
+        self.schedule_next_run(target.hour, target.minute)
+        self.run_auto_seeding()
     
     def run_auto_seeding(self):
         """Auto run seeding: Generate scenario -> Save -> Run."""
@@ -2037,12 +2774,11 @@ class TelegramToolWidget(QWidget):
     
     def stop_seeding(self):
         logger.info("⏹️ Đang dừng tác vụ...")
+        self.delay_timer.stop()
         if self.seeding_worker:
             self.seeding_worker.stop()
-            self.seeding_thread.quit()
         if self.join_group_worker:
             self.join_group_worker.stop()
-            self.join_group_thread.quit()
         self.status_label.setText("⏹️ Đã dừng!")
         logger.warning("⏹️ Tác vụ đã bị dừng bởi người dùng")
 
@@ -7,6 +7,8 @@ Matches Main.pyw database structure
 
 import sqlite3
 import os
+import queue
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
 
@@ -16,6 +18,9 @@ DATA_DIR = BASE_DIR / 'data'
 DATABASE_PATH = DATA_DIR / 'Data.db'
 UPLOAD_FOLDER = DATA_DIR / 'uploaded_sessions'
 
+# Số connection rảnh giữ lại trong pool (dùng lại giữa các request, page cache SQLite không bị nguội)
+DB_POOL_SIZE = 8
+
 # Ensure directories exist
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
@@ -28,6 +33,40 @@ def get_db_connection():
     return conn
 
 
+_db_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
+
+def _open_pooled_connection():
+    """Open a long-lived connection for the pool (WAL, big page cache, mmap)"""
+    # cached_statements: mỗi connection giữ sẵn statement đã prepare cho các SQL hay dùng
+    conn = sqlite3.connect(DATABASE_PATH, check_same_thread=False, cached_statements=256)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA temp_store=MEMORY')
+    conn.execute('PRAGMA cache_size=-64000')
+    conn.execute('PRAGMA mmap_size=268435456')
+    return conn
+
+
+@contextmanager
+def db_conn():
+    """Borrow a pooled connection; an unfinished transaction is rolled back on return"""
+    try:
+        conn = _db_pool.get_nowait()
+    except queue.Empty:
+        conn = _open_pooled_connection()
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        try:
+            _db_pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
 def init_database():
     """Initialize database with all required tables (match Main.pyw)"""
     conn = get_db_connection()
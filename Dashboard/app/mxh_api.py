@@ -1,10 +1,12 @@
 import sqlite3
 import json
+import logging
 from datetime import datetime, timezone
 from flask import Blueprint, request, jsonify
 from app.database import get_db_connection
 
 mxh_api_bp = Blueprint("mxh_api", __name__, url_prefix="/mxh/api")
+logger = logging.getLogger(__name__)
 
 
 @mxh_api_bp.route("/accounts", methods=["GET"])
@@ -407,15 +409,15 @@ def update_account(account_id):
             if field in data:
                 account_fields[field] = data[field]
         
-        print(f"🔍 Account fields to update: {account_fields}")
+        logger.debug("🔍 Account fields to update: %s", account_fields)
         
         if account_fields:
             account_fields["updated_at"] = now
             set_clause = ", ".join([f"{key} = ?" for key in account_fields.keys()])
             params = list(account_fields.values()) + [account_id]
             sql = f"UPDATE mxh_accounts SET {set_clause} WHERE id = ?"
-            print(f"🔍 SQL: {sql}")
-            print(f"🔍 Params: {params}")
+            logger.debug("🔍 SQL: %s", sql)
+            logger.debug("🔍 Params: %s", params)
             conn.execute(sql, params)
 
         # --- Update mxh_cards table (for card_name) ---
@@ -429,8 +431,8 @@ def update_account(account_id):
         
         updated_account = conn.execute("SELECT a.*, c.card_name, c.platform, c.group_id FROM mxh_accounts a JOIN mxh_cards c ON a.card_id = c.id WHERE a.id = ?", (account_id,)).fetchone()
         result = dict(updated_account)
-        print(f"🔍 Returning updated account: {result}")
-        print(f"🔍 Email in result: {result.get('email', 'NOT FOUND')}")
+        logger.debug("🔍 Returning updated account: %s", result)
+        logger.debug("🔍 Email in result: %s", result.get('email', 'NOT FOUND'))
         return jsonify(result)
 
     except Exception as e:
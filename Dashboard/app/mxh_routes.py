@@ -1,10 +1,12 @@
 import sqlite3
 import json
+import logging
 from datetime import datetime, timezone
 from flask import Blueprint, request, jsonify, render_template
 from app.database import get_db_connection
 
 mxh_bp = Blueprint("mxh", __name__, url_prefix="/mxh")
+logger = logging.getLogger(__name__)
 
 
 # --- ALIAS: giữ tương thích FE cũ - tạo/xóa CARD qua /api/accounts ---
@@ -317,8 +319,8 @@ def update_account_direct(account_id):
         }
         
         # 🔍 Debug: Kiểm tra dữ liệu nhận được từ frontend
-        print(f"🔍 [update_account_direct] Received data: {data}")
-        print(f"🔍 [update_account_direct] Email in data: {data.get('email', 'NOT FOUND')}")
+        logger.debug("🔍 [update_account_direct] Received data: %s", data)
+        logger.debug("🔍 [update_account_direct] Email in data: %s", data.get('email', 'NOT FOUND'))
         
         updates = {}
         for field in allowed_fields:
@@ -326,8 +328,8 @@ def update_account_direct(account_id):
                 updates[field] = data[field]
         
         # 🔍 Debug: Kiểm tra các trường sẽ được cập nhật
-        print(f"🔍 [update_account_direct] Fields to update: {list(updates.keys())}")
-        print(f"🔍 [update_account_direct] Email in updates: {updates.get('email', 'NOT FOUND')}")
+        logger.debug("🔍 [update_account_direct] Fields to update: %s", list(updates.keys()))
+        logger.debug("🔍 [update_account_direct] Email in updates: %s", updates.get('email', 'NOT FOUND'))
         
         # Update card_name if provided
         if card_name is not None:
@@ -350,8 +352,8 @@ def update_account_direct(account_id):
             
             # 🔍 Debug: Kiểm tra SQL query và giá trị
             sql_query = f"UPDATE mxh_accounts SET {set_clause} WHERE id = ?"
-            print(f"🔍 [update_account_direct] SQL: {sql_query}")
-            print(f"🔍 [update_account_direct] Values: {values}")
+            logger.debug("🔍 [update_account_direct] SQL: %s", sql_query)
+            logger.debug("🔍 [update_account_direct] Values: %s", values)
             
             conn.execute(sql_query, values)
         
@@ -368,7 +370,7 @@ def update_account_direct(account_id):
         # 🔍 Debug: Kiểm tra kết quả sau khi cập nhật
         if updated:
             updated_dict = dict(updated)
-            print(f"🔍 [update_account_direct] Updated account email: {updated_dict.get('email', 'NOT FOUND')}")
+            logger.debug("🔍 [update_account_direct] Updated account email: %s", updated_dict.get('email', 'NOT FOUND'))
             return jsonify(updated_dict)
         return jsonify({"error": "Account not found after update"}), 404
         
@@ -617,16 +619,16 @@ def acc_reset(account_id):
     """POST /mxh/api/accounts/<account_id>/reset - reset account về trạng thái mặc định"""
     conn = get_db_connection()
     try:
-        print(f"🔄 Resetting account {account_id}...")
+        logger.debug("🔄 Resetting account %s...", account_id)
         now_iso = _now_iso()
         
         # Check if account exists first
         existing = conn.execute("SELECT id, username, phone FROM mxh_accounts WHERE id = ?", (account_id,)).fetchone()
         if not existing:
-            print(f"❌ Account {account_id} not found!")
+            logger.error("❌ Account %s not found!", account_id)
             return jsonify({"error": "Account not found"}), 404
         
-        print(f"📝 Before reset: user={existing['username']}, phone={existing['phone']}")
+        logger.debug("📝 Before reset: user=%s, phone=%s", existing['username'], existing['phone'])
         
         cursor = conn.execute("""
             UPDATE mxh_accounts
@@ -646,10 +648,10 @@ def acc_reset(account_id):
         """, (now_iso, account_id))
         
         rows_affected = cursor.rowcount
-        print(f"📊 UPDATE affected {rows_affected} rows")
+        logger.debug("📊 UPDATE affected %s rows", rows_affected)
         
         conn.commit()
-        print(f"✅ Committed transaction")
+        logger.debug("✅ Committed transaction")
         
         # Return updated account data
         updated = conn.execute("""
@@ -660,11 +662,11 @@ def acc_reset(account_id):
         """, (account_id,)).fetchone()
         
         if updated:
-            print(f"📤 After reset: user={updated['username']}, phone={updated['phone']}")
+            logger.debug("📤 After reset: user=%s, phone=%s", updated['username'], updated['phone'])
             return jsonify(dict(updated))
         return jsonify({"message": "Account reset successfully"})
     except Exception as e:
-        print(f"❌ Error resetting account: {e}")
+        logger.error("❌ Error resetting account: %s", e)
         import traceback
         traceback.print_exc()
         return jsonify({"error": str(e)}), 500
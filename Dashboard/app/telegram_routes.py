@@ -6,18 +6,24 @@ Routes xử lý các API cho Telegram Manager
 Ported from Main.pyw để match 100%
 """
 
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify, current_app, Response
 from werkzeug.utils import secure_filename
 import os
 import json
+import logging
 import uuid
 import traceback
 import shutil
 import re
 import sqlite3
+import sys
+import time
 from datetime import datetime
 from pathlib import Path
-from threading import Thread
+from threading import Thread, Lock, Event
+from collections import deque
+
+from app.database import db_conn
 
 # Import workers
 from app.telegram_workers import (
@@ -29,183 +35,307 @@ from app.telegram_workers import (
 
 # Tạo Blueprint cho Telegram
 telegram_bp = Blueprint('telegram', __name__, url_prefix='/telegram')
+logger = logging.getLogger(__name__)
 
 # Đường dẫn lưu trữ
 BASE_DIR = Path(__file__).parent.parent
 DATA_DIR = BASE_DIR / 'data'
 DATABASE_PATH = DATA_DIR / 'Data.db'
 UPLOAD_FOLDER = DATA_DIR / 'uploaded_sessions'
+PROXY_CONFIG_FILE = DATA_DIR / 'telegram' / 'proxy_config.json'
 ADMIN_SESSION_FOLDER = "Adminsession"
+UPLOAD_COPY_BUFFER = 256 * 1024  # Chunk copy khi lưu file upload (mặc định của Werkzeug chỉ 16 KiB)
+# os.sendfile sang một file thường chỉ chạy được trên Linux (macOS/BSD chỉ nhận socket đích)
+SENDFILE_TO_FILE = sys.platform.startswith('linux')
 
 # Global task storage (in-memory, like Main.pyw)
 TASKS = {}
+TASK_QUEUE_MAXLEN = 10000  # results tối đa chờ UI lấy; UI không poll thì bỏ bớt cái cũ nhất
+TASK_MESSAGES_MAXLEN = 200  # messages chỉ còn thông báo lỗi/sự kiện - đếm ngược nằm ở current_message/wait_until
+TASK_STREAM_KEEPALIVE = 15  # Giây - không có gì mới thì vẫn gửi snapshot để giữ kết nối SSE
+TASK_INTERNAL_KEYS = ('lock', 'updated', 'stop_requested', 'finished_at')  # Không trả về client
+FINISHED_TASK_TTL = 3600  # Giây - task đã kết thúc quá lâu thì bỏ khỏi TASKS khi tạo task mới
+# JSON của /api/active-tasks dựng sẵn; ai đổi status/total/processed/success/failed của task thì set dirty
+ACTIVE_TASKS_CACHE = {'dirty': True, 'body': '{}'}
+
+# task_name -> (worker, hàm lấy tham số thêm cho worker từ config của request)
+TASK_DISPATCH = {
+    'check-live': (check_single_session_worker, lambda config: ()),
+    'joinGroup': (join_group_worker, lambda config: (config.get('links', []),)),
+    'seedingGroup': (seeding_group_worker, lambda config: (config,)),  # Pass whole config
+}
+
+# Giá trị hiển thị cho session chưa có metadata: (full_name, username, is_live, status_text)
+DEFAULT_SESSION_METADATA = ('Chưa kiểm tra', '', None, 'Sẵn sàng')
+
+# Số điện thoại trong tên file session
+PHONE_RE = re.compile(r'\+?\d{9,15}')
+# Đúng hậu tố mà manage_groups/remove_folder_in_background đặt (uuid4().hex) - tên nhóm thường không khớp
+LEFTOVER_UPLOAD_DIR_RE = re.compile(r'\.(?:tmp-|pending_delete_)[0-9a-f]{32}$')
+
+# Proxy config đã parse, kèm mtime của file lúc đọc
+_PROXY_CACHE = {'mtime': 0, 'data': None}
+
+# SQL dùng lại nhiều lần - luôn đúng một chuỗi để trúng statement cache của connection
+SQL_LIST_GROUPS = "SELECT id, name, folder_path FROM session_groups ORDER BY name"
+SQL_GROUP_FOLDER = 'SELECT folder_path FROM session_groups WHERE id = ?'
+SQL_ALL_GROUP_FOLDERS = 'SELECT folder_path FROM session_groups'
+SQL_INSERT_GROUP = 'INSERT INTO session_groups (name, folder_path) VALUES (?, ?) ON CONFLICT(name) DO NOTHING'
+# Folder của nhóm + metadata các session trong một lượt (filename NULL khi nhóm chưa có metadata)
+SQL_GROUP_SESSIONS = """SELECT g.folder_path, m.filename, m.full_name, m.username, m.is_live, m.status_text
+   FROM session_groups g LEFT JOIN session_metadata m ON m.group_id = g.id
+   WHERE g.id = ?"""
+SQL_DELETE_SESSION_METADATA = 'DELETE FROM session_metadata WHERE group_id = ? AND filename = ?'
+SQL_GET_TASK_CONFIG = 'SELECT config_json FROM task_configs WHERE task_name = ?'
+SQL_UPSERT_TASK_CONFIG = 'INSERT INTO task_configs (task_name, config_json) VALUES (?, ?) ON CONFLICT(task_name) DO UPDATE SET config_json=excluded.config_json'
+SQL_SAVE_GLOBAL_SETTINGS = 'UPDATE auto_seeding_settings SET core = ?, delay_per_session = ?, delay_between_batches = ?, admin_enabled = ?, admin_delay = ? WHERE id = ?'
+# Sửa tay một cột của session: mỗi cột cho phép có sẵn một câu UPSERT cố định (tên cột không ghép từ request)
+SQL_UPSERT_SESSION_FIELD = {
+    field: f'INSERT INTO session_metadata (group_id, filename, {field}) VALUES (?, ?, ?) '
+           f'ON CONFLICT(group_id, filename) DO UPDATE SET {field}=excluded.{field}'
+    for field in ('full_name', 'username')
+}
 
 # Tạo thư mục nếu chưa có
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
 
-def get_db_connection():
-    """ Get database connection"""
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+def load_proxies():
+    """ Load proxies from database or file (parse lại chỉ khi file đổi mtime)"""
+    try:
+        mtime = os.stat(PROXY_CONFIG_FILE).st_mtime_ns
+    except OSError:
+        return {'enabled': False, 'proxies': []}
+    if _PROXY_CACHE['mtime'] == mtime:
+        return _PROXY_CACHE['data']
+    try:
+        with open(PROXY_CONFIG_FILE, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except:
+        return {'enabled': False, 'proxies': []}
+    _PROXY_CACHE['mtime'], _PROXY_CACHE['data'] = mtime, data
+    return data
 
 
-def load_proxies():
-    """ Load proxies from database or file"""
-    proxy_file = DATA_DIR / 'telegram' / 'proxy_config.json'
-    if proxy_file.exists():
-        try:
-            with open(proxy_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            pass
-    return {'enabled': False, 'proxies': []}
+def remove_folder_in_background(folder_path):
+    """ Đổi tên thư mục ra chỗ khác ngay rồi xóa ở thread nền, request không phải chờ rmtree"""
+    pending_path = f"{folder_path}.pending_delete_{uuid.uuid4().hex}"
+    try:
+        os.replace(folder_path, pending_path)
+    except OSError:
+        shutil.rmtree(folder_path)  # Không đổi tên được (file đang bị giữ...) thì xóa trực tiếp như cũ
+        return
+    Thread(target=shutil.rmtree, args=(pending_path,), kwargs={'ignore_errors': True}, daemon=True).start()
+
+
+def sweep_leftover_upload_dirs(state):
+    """ Xóa thư mục .pending_delete_* / .tmp-* còn sót lại khi process trước bị tắt giữa chừng"""
+    with db_conn() as conn:
+        group_folders = {os.path.normpath(row[0]) for row in conn.execute(SQL_ALL_GROUP_FOLDERS)}
+    # Thư mục đang là folder_path của một nhóm thì không bao giờ xóa, dù tên trông giống thư mục tạm
+    leftovers = [
+        entry.path for entry in os.scandir(UPLOAD_FOLDER)
+        if entry.is_dir(follow_symlinks=False) and LEFTOVER_UPLOAD_DIR_RE.search(entry.name)
+        and os.path.normpath(entry.path) not in group_folders
+    ]
+    for path in leftovers:
+        Thread(target=shutil.rmtree, args=(path,), kwargs={'ignore_errors': True}, daemon=True).start()
+    if leftovers:
+        logger.info(f"🧹 Dọn {len(leftovers)} thư mục upload còn sót")
+
+# Chạy một lần khi blueprint được đăng ký (record_once không trả lại hàm nên không dùng làm decorator)
+telegram_bp.record_once(sweep_leftover_upload_dirs)
 
 
 def save_proxies(proxy_config):
     """ Save proxies to file"""
-    proxy_file = DATA_DIR / 'telegram' / 'proxy_config.json'
-    proxy_file.parent.mkdir(parents=True, exist_ok=True)
-    with open(proxy_file, 'w', encoding='utf-8') as f:
+    PROXY_CONFIG_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(PROXY_CONFIG_FILE, 'w', encoding='utf-8') as f:
         json.dump(proxy_config, f, ensure_ascii=False, indent=2)
+    _PROXY_CACHE['mtime'] = 0  # mtime_ns có thể trùng nếu ghi 2 lần liên tiếp - ép đọc lại
+
+
+def phone_from_filename(filename):
+    """ Số điện thoại trong tên file session (tên file nếu không có)"""
+    # Đa số file tên dạng <số>.session / +<số>.session - kiểm tra thẳng, không cần regex
+    stem = filename[:-len('.session')]
+    digits = stem[1:] if stem.startswith('+') else stem
+    if 9 <= len(digits) <= 15 and digits.isdecimal():
+        return stem
+    phone_match = PHONE_RE.search(filename.replace('.session', ''))
+    return phone_match.group(0) if phone_match else filename
+
+
+def save_upload(file, dest_path):
+    """ Lưu file upload - dùng os.sendfile (copy trong kernel) khi Werkzeug đã spool ra file tạm thật"""
+    stream = file.stream
+    # SpooledTemporaryFile còn trong RAM thì fileno() sẽ ép ghi ra đĩa - để copyfileobj xử lý
+    if SENDFILE_TO_FILE and getattr(stream, '_rolled', True) and stream.seekable():
+        try:
+            src_fd = stream.fileno()
+        except (AttributeError, OSError, ValueError):
+            src_fd = None
+        if src_fd is not None:
+            stream.flush()
+            start = offset = stream.tell()
+            dst_fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                while True:
+                    sent = os.sendfile(dst_fd, src_fd, offset, UPLOAD_COPY_BUFFER * 64)
+                    if not sent:
+                        break
+                    offset += sent
+            except OSError:
+                # Filesystem không hỗ trợ sendfile - bỏ file dở, copy lại từ đầu bằng file.save
+                os.close(dst_fd)
+                os.remove(dest_path)
+                stream.seek(start)
+            else:
+                os.close(dst_fd)
+                return
+    file.save(dest_path, buffer_size=UPLOAD_COPY_BUFFER)
+
+
+def sweep_finished_tasks():
+    """ Bỏ các task đã kết thúc quá FINISHED_TASK_TTL khỏi TASKS để dict không phình mãi"""
+    cutoff = time.monotonic() - FINISHED_TASK_TTL
+    expired = [task_id for task_id, task in list(TASKS.items()) if (task.get('finished_at') or cutoff) < cutoff]
+    for task_id in expired:
+        TASKS.pop(task_id, None)
+    if expired:
+        ACTIVE_TASKS_CACHE['dirty'] = True
+
+
+def drain_task_snapshot(task):
+    """ Trạng thái task kèm results/messages mới, lấy hết dưới lock (serialize ngoài lock)"""
+    with task['lock']:
+        results, messages = list(task['results']), list(task['messages'])
+        task['results'].clear()
+        task['messages'].clear()
+    
+    snapshot = {key: value for key, value in task.items() if key not in TASK_INTERNAL_KEYS}
+    snapshot['results'], snapshot['messages'] = results, messages
+    return snapshot
 
 
 @telegram_bp.route('/api/groups', methods=['GET', 'POST'])
 def manage_groups():
     """ Lấy danh sách hoặc tạo nhóm session (match Main.pyw)"""
-    conn = get_db_connection()
-    
     if request.method == 'GET':
-        groups = conn.execute("SELECT * FROM session_groups ORDER BY name").fetchall()
-        conn.close()
-        result = [dict(row) for row in groups]
+        with db_conn() as conn:
+            groups = conn.execute(SQL_LIST_GROUPS).fetchall()
+        # Đọc theo vị trí cột - không dựng dict(row) rồi mới chép sang JSON
+        result = [{'id': row[0], 'name': row[1], 'folder_path': row[2]} for row in groups]
         return jsonify(result)
     
-    if request.method == 'POST':
+    try:
+        name = request.form.get('name')
+        files = request.files.getlist('session_files')
+        
+        
+        if not name or not files or files[0].filename == '':
+            return jsonify({'error': 'Tên nhóm và file không được trống'}), 400
+        
+        group_folder_name = secure_filename(name)
+        group_path = os.path.join(UPLOAD_FOLDER, group_folder_name)
+        
+        # Ghi toàn bộ file vào thư mục tạm trước khi đụng tới DB - I/O chậm không giữ transaction mở,
+        # rename sang group_path sau cùng nên crash giữa chừng không để lại nhóm dở dang
+        staging_path = f"{group_path}.tmp-{uuid.uuid4().hex}"
+        os.makedirs(staging_path)
         try:
-            name = request.form.get('name')
-            files = request.files.getlist('session_files')
-            
-            
-            if not name or not files or files[0].filename == '':
-                conn.close()
-                return jsonify({'error': 'Tên nhóm và file không được trống'}), 400
-            
-            # Check if group name already exists in database
-            existing_group = conn.execute(
-                'SELECT id FROM session_groups WHERE name = ?', (name,)
-            ).fetchone()
-            
-            if existing_group:
-                conn.close()
-                return jsonify({'error': f'Tên nhóm "{name}" đã tồn tại.'}), 409
-            
-            group_folder_name = secure_filename(name)
-            group_path = os.path.join(UPLOAD_FOLDER, group_folder_name)
-            
-            # If folder exists but not in DB, remove it first (cleanup orphaned folders)
-            if os.path.exists(group_path):
-                shutil.rmtree(group_path)
-            
-            os.makedirs(group_path)
-            
             saved_count = 0
             for file in files:
                 if file and file.filename.endswith('.session'):
-                    file.save(os.path.join(group_path, secure_filename(file.filename)))
+                    save_upload(file, os.path.join(staging_path, secure_filename(file.filename)))
                     saved_count += 1
-            try:
-                conn.execute(
-                    'INSERT INTO session_groups (name, folder_path) VALUES (?, ?)',
-                    (name, group_path),
-                )
-                conn.commit()
-                return jsonify({'success': True, 'message': f'Tạo nhóm thành công với {saved_count} sessions'}), 201
-            except sqlite3.IntegrityError:
-                shutil.rmtree(group_path)
-                return jsonify({'error': 'Tên nhóm đã tồn tại trong DB.'}), 409
-            finally:
-                conn.close()
+            
+            with db_conn() as conn:
+                # Giữ tên nhóm bằng chính lệnh INSERT (UNIQUE(name)) - trùng tên thì bỏ thư mục tạm
+                cursor = conn.execute(SQL_INSERT_GROUP, (name, group_path))
+                if cursor.rowcount == 0:
+                    return jsonify({'error': f'Tên nhóm "{name}" đã tồn tại.'}), 409
                 
-        except Exception as e:
-            conn.close()
-            return jsonify({'error': str(e)}), 500
+                # Thư mục cũ không có trong DB (mồ côi) thì dời đi trước khi rename
+                if os.path.exists(group_path):
+                    remove_folder_in_background(group_path)
+                os.replace(staging_path, group_path)
+                conn.commit()
+        finally:
+            if os.path.exists(staging_path):
+                shutil.rmtree(staging_path, ignore_errors=True)
+        
+        return jsonify({'success': True, 'message': f'Tạo nhóm thành công với {saved_count} sessions'}), 201
+            
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 
 @telegram_bp.route('/api/groups/<int:group_id>', methods=['DELETE'])
 def delete_group(group_id):
     """ Xóa nhóm session (match Main.pyw)"""
-    conn = get_db_connection()
-    try:
-        group = conn.execute(
-            'SELECT folder_path FROM session_groups WHERE id = ?', (group_id,)
-        ).fetchone()
-        
-        if group and os.path.exists(group['folder_path']):
-            shutil.rmtree(group['folder_path'])
-        conn.execute('DELETE FROM session_metadata WHERE group_id = ?', (group_id,))
-        conn.execute('DELETE FROM session_groups WHERE id = ?', (group_id,))
-        conn.commit()
-        
-        return jsonify({'success': True})
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+    with db_conn() as conn:
+        try:
+            group = conn.execute(
+                SQL_GROUP_FOLDER, (group_id,)
+            ).fetchone()
+            
+            if group and os.path.exists(group['folder_path']):
+                remove_folder_in_background(group['folder_path'])
+            conn.execute('DELETE FROM session_metadata WHERE group_id = ?', (group_id,))
+            conn.execute('DELETE FROM session_groups WHERE id = ?', (group_id,))
+            conn.commit()
+            
+            return jsonify({'success': True})
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
 
 
 @telegram_bp.route('/api/groups/<int:group_id>/sessions', methods=['GET'])
 def get_group_sessions(group_id):
     """ Lấy danh sách session trong nhóm (match Main.pyw)"""
-    conn = get_db_connection()
-    try:
-        group = conn.execute(
-            'SELECT folder_path FROM session_groups WHERE id = ?', (group_id,)
-        ).fetchone()
-        
-        if not group:
-            return jsonify({'error': 'Không tìm thấy nhóm'}), 404
-        
-        # Lấy metadata từ database
-        metadata_rows = conn.execute(
-            'SELECT * FROM session_metadata WHERE group_id = ?', (group_id,)
-        ).fetchall()
-        
-        metadata_map = {row['filename']: dict(row) for row in metadata_rows}
-        
-        sessions = []
-        folder_path = group['folder_path']
-        
-        if os.path.exists(folder_path):
-            session_files = sorted(
-                [f for f in os.listdir(folder_path) if f.endswith('.session')]
-            )
+    with db_conn() as conn:
+        try:
+            # Lấy folder + metadata từ database (một query JOIN)
+            rows = conn.execute(SQL_GROUP_SESSIONS, (group_id,)).fetchall()
             
-            for i, filename in enumerate(session_files):
-                meta = metadata_map.get(filename, {})
-                
-                # Extract phone từ filename
-                phone_match = re.search(r'\+?\d{9,15}', filename.replace('.session', ''))
-                phone = phone_match.group(0) if phone_match else filename
+            if not rows:
+                return jsonify({'error': 'Không tìm thấy nhóm'}), 404
+            
+            # filename -> (full_name, username, is_live, status_text)
+            metadata_map = {row[1]: tuple(row)[2:] for row in rows if row[1] is not None}
+            
+            sessions = []
+            folder_path = rows[0][0]
+            
+            if os.path.exists(folder_path):
+                with os.scandir(folder_path) as entries:
+                    session_files = sorted(
+                        entry.name for entry in entries
+                        if entry.name.endswith('.session') and entry.is_file(follow_symlinks=False)
+                    )
                 
-                sessions.append({
-                    'stt': i + 1,
-                    'phone': phone,
-                    'filename': filename,
-                    'full_name': meta.get('full_name', 'Chưa kiểm tra'),
-                    'username': meta.get('username', ''),
-                    'is_live': meta.get('is_live'),
-                    'status_text': meta.get('status_text', 'Sẵn sàng'),
-                })
-        
-        return jsonify(sessions)
-        
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+                for i, filename in enumerate(session_files):
+                    full_name, username, is_live, status_text = metadata_map.get(filename, DEFAULT_SESSION_METADATA)
+                    
+                    # Extract phone từ filename
+                    phone = phone_from_filename(filename)
+                    
+                    sessions.append({
+                        'stt': i + 1,
+                        'phone': phone,
+                        'filename': filename,
+                        'full_name': full_name,
+                        'username': username,
+                        'is_live': is_live,
+                        'status_text': status_text,
+                    })
+            
+            return jsonify(sessions)
+            
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
 
 
 @telegram_bp.route('/api/upload-admin-sessions', methods=['POST'])
@@ -224,21 +354,18 @@ def upload_admin_sessions():
         file_count = 0
         for file in files:
             if file and file.filename.endswith('.session'):
-                file.save(os.path.join(admin_folder_path, secure_filename(file.filename)))
+                save_upload(file, os.path.join(admin_folder_path, secure_filename(file.filename)))
                 file_count += 1
         if file_count == 0:
             return jsonify({'error': 'Không có file .session hợp lệ'}), 400
         
         # Ensure Adminsession group exists in database
-        conn = get_db_connection()
-        try:
+        with db_conn() as conn:
             conn.execute(
                 'INSERT INTO session_groups (name, folder_path) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET folder_path=excluded.folder_path',
                 (ADMIN_SESSION_FOLDER, admin_folder_path),
             )
             conn.commit()
-        finally:
-            conn.close()
         
         return jsonify({
             'success': True,
@@ -252,28 +379,26 @@ def upload_admin_sessions():
 @telegram_bp.route('/api/config/<task_name>', methods=['GET', 'POST'])
 def manage_config(task_name):
     """ Lấy hoặc lưu cấu hình task (match Main.pyw)"""
-    conn = get_db_connection()
-    try:
-        if request.method == 'GET':
-            row = conn.execute(
-                'SELECT config_json FROM task_configs WHERE task_name = ?', (task_name,)
-            ).fetchone()
-            result = json.loads(row['config_json']) if row else {}
-            return jsonify(result)
-        
-        if request.method == 'POST':
-            config_data = request.get_json()
-            conn.execute(
-                'INSERT INTO task_configs (task_name, config_json) VALUES (?, ?) ON CONFLICT(task_name) DO UPDATE SET config_json=excluded.config_json',
-                (task_name, json.dumps(config_data, ensure_ascii=False)),
-            )
-            conn.commit()
-            return jsonify({'success': True, 'message': 'Đã lưu cấu hình.'})
+    with db_conn() as conn:
+        try:
+            if request.method == 'GET':
+                row = conn.execute(
+                    SQL_GET_TASK_CONFIG, (task_name,)
+                ).fetchone()
+                result = json.loads(row['config_json']) if row else {}
+                return jsonify(result)
             
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
-    finally:
-        conn.close()
+            if request.method == 'POST':
+                config_data = request.get_json()
+                conn.execute(
+                    SQL_UPSERT_TASK_CONFIG,
+                    (task_name, json.dumps(config_data, ensure_ascii=False)),
+                )
+                conn.commit()
+                return jsonify({'success': True, 'message': 'Đã lưu cấu hình.'})
+                
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
 
 
 @telegram_bp.route('/api/proxies', methods=['GET'])
@@ -291,7 +416,7 @@ def update_proxies():
         proxies_text = data.get('proxies', '')
         
         # Parse proxies
-        proxies = [p.strip() for p in proxies_text.split('\n') if p.strip()]
+        proxies = list(filter(None, map(str.strip, proxies_text.splitlines())))
         
         proxy_config = {
             'enabled': enabled,
@@ -326,9 +451,8 @@ def run_task():
             return jsonify({'error': 'Dữ liệu không hợp lệ'}), 400
         
         # Get group info
-        conn = get_db_connection()
-        group = conn.execute('SELECT folder_path FROM session_groups WHERE id = ?', (group_id,)).fetchone()
-        conn.close()
+        with db_conn() as conn:
+            group = conn.execute(SQL_GROUP_FOLDER, (group_id,)).fetchone()
         
         if not group or not group['folder_path']:
             return jsonify({'error': 'Không tìm thấy nhóm hoặc đường dẫn thư mục của nhóm không hợp lệ.'}), 404
@@ -337,41 +461,19 @@ def run_task():
         proxy_config = load_proxies()
         proxies_to_use = proxy_config['proxies'] if proxy_config.get('enabled', False) else []
         
-        # Create task (match Main.pyw structure)
-        task_id = str(uuid.uuid4())
-        TASKS[task_id] = {
-            'task_name': task_name,
-            'group_id': group_id,
-            'status': 'running',
-            'total': len(filenames),
-            'processed': 0,
-            'success': 0,
-            'failed': 0,
-            'results': [],
-            'messages': []
-        }
-        
         # Determine worker function based on task name
-        worker_func, args = None, []
-        if task_name == "check-live":
-            worker_func = check_single_session_worker
-        elif task_name == "joinGroup":
-            worker_func = join_group_worker
-            args = [config.get("links", [])]
-        elif task_name == "seedingGroup":
-            worker_func = seeding_group_worker
-            args = [config]  # Pass whole config
-        
-        if not worker_func:
-            if task_id in TASKS:
-                del TASKS[task_id]
+        dispatch = TASK_DISPATCH.get(task_name)
+        if dispatch is None:
             return jsonify({'error': 'Tác vụ không được hỗ trợ'}), 400
+        worker_func, build_args = dispatch
+        args = build_args(config)
         
         # Start worker thread (match Main.pyw)
         # Get UPLOAD_FOLDER from Flask config to pass to worker
         from flask import current_app
         upload_folder = current_app.config.get("UPLOAD_FOLDER", "")
         
+        task_id = str(uuid.uuid4())
         thread = Thread(
             target=run_task_in_thread,
             args=(
@@ -382,7 +484,33 @@ def run_task():
             kwargs={"proxies": proxies_to_use}
         )
         thread.daemon = True
-        thread.start()
+        
+        sweep_finished_tasks()
+        
+        # Create task (match Main.pyw structure) - chỉ ngay trước khi start, start lỗi thì gỡ ra
+        TASKS[task_id] = {
+            'task_name': task_name,
+            'group_id': group_id,
+            'status': 'running',
+            'total': len(filenames),
+            'processed': 0,
+            'success': 0,
+            'failed': 0,
+            'results': deque(maxlen=TASK_QUEUE_MAXLEN),
+            'messages': deque(maxlen=TASK_MESSAGES_MAXLEN),
+            'current_message': None,  # Đang chờ gì (chờ đợt tiếp / admin trả lời); UI đếm ngược tới wait_until
+            'wait_until': None,  # Epoch giây kết thúc lượt chờ hiện tại
+            'finished_at': None,  # Worker ghi time.monotonic() khi kết thúc; key có sẵn để dict không đổi kích thước
+            'lock': Lock(),  # Giữ khi worker append và khi task_status lấy results/messages
+            'updated': Event(),  # Worker set khi có results/messages mới hoặc task kết thúc
+            'stop_requested': Event()  # stop-task set - cắt ngang lượt chờ giữa các đợt
+        }
+        ACTIVE_TASKS_CACHE['dirty'] = True
+        try:
+            thread.start()
+        except Exception:
+            TASKS.pop(task_id, None)
+            raise
         
         return jsonify({'task_id': task_id}), 202
         
@@ -398,27 +526,22 @@ def save_telegram_global_settings():
         if not data:
             return jsonify({'error': 'Invalid JSON payload'}), 400
         
-        conn = get_db_connection()
-        # Match Main.pyw: UPDATE auto_seeding_settings
-        conn.execute(
-            """UPDATE auto_seeding_settings SET
-                 core = ?,
-                 delay_per_session = ?,
-                 delay_between_batches = ?,
-                 admin_enabled = ?,
-                 admin_delay = ?
-               WHERE id = 1;
-            """,
+        # Một object (dòng id=1 như Main.pyw) hoặc danh sách object có 'id' để lưu nhiều dòng một lượt
+        rows = [
             (
-                data.get('core', 5),
-                data.get('delay_per_session', 10),
-                data.get('delay_between_batches', 600),
-                data.get('admin_enabled', False),
-                data.get('admin_delay', 10)
+                settings.get('core', 5),
+                settings.get('delay_per_session', 10),
+                settings.get('delay_between_batches', 600),
+                settings.get('admin_enabled', False),
+                settings.get('admin_delay', 10),
+                settings.get('id', 1),
             )
-        )
-        conn.commit()
-        conn.close()
+            for settings in (data if isinstance(data, list) else [data])
+        ]
+        
+        with db_conn() as conn:
+            conn.executemany(SQL_SAVE_GLOBAL_SETTINGS, rows)
+            conn.commit()
         
         return jsonify({'success': True, 'message': 'Đã lưu cài đặt chung.'})
         
@@ -436,11 +559,27 @@ def task_status(task_id):
         return jsonify({'status': 'not_found'}), 404
     
     # Match Main.pyw: Return and clear results/messages
-    response = task.copy()
-    response['results'], response['messages'] = task.get('results', []), task.get('messages', [])
-    task['results'], task['messages'] = [], []
+    return jsonify(drain_task_snapshot(task))
+
+
+@telegram_bp.route('/api/task-stream/<task_id>')
+def task_stream(task_id):
+    """Đẩy tiến độ task qua Server-Sent Events mỗi khi worker có kết quả mới (thay cho poll task-status)"""
+    task = TASKS.get(task_id)
+    if not task:
+        return jsonify({'status': 'not_found'}), 404
+    
+    def event_stream():
+        # Gửi trạng thái hiện tại ngay - stream trước có thể đã clear cờ updated (trang mở lại giữa lượt chờ)
+        snapshot = drain_task_snapshot(task)
+        yield f"data: {json.dumps(snapshot, ensure_ascii=False)}\n\n"
+        while snapshot['status'] == 'running':
+            task['updated'].wait(TASK_STREAM_KEEPALIVE)
+            task['updated'].clear()
+            snapshot = drain_task_snapshot(task)
+            yield f"data: {json.dumps(snapshot, ensure_ascii=False)}\n\n"
     
-    return jsonify(response)
+    return Response(event_stream(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
 
 
 @telegram_bp.route('/api/stop-task/<task_id>', methods=['POST'])
@@ -448,13 +587,25 @@ def stop_task_route(task_id):
     """ Dừng task (match Main.pyw)"""
     if task_id in TASKS:
         TASKS[task_id]['status'] = 'stopped'
+        TASKS[task_id]['updated'].set()
+        TASKS[task_id]['stop_requested'].set()
+        ACTIVE_TASKS_CACHE['dirty'] = True
     return jsonify({'message': 'Yêu cầu dừng đã được gửi.'}), 200
 
 
 @telegram_bp.route('/api/active-tasks')
 def get_active_tasks():
-    """ Lấy danh sách task đang chạy (match Main.pyw)"""
-    active_tasks = {
+    """ Lấy danh sách task đang chạy (match Main.pyw) - chỉ dựng lại JSON khi có task thay đổi"""
+    if ACTIVE_TASKS_CACHE['dirty']:
+        # Hạ cờ trước khi dựng: worker cập nhật trong lúc dựng sẽ set lại, lần poll sau dựng tiếp
+        ACTIVE_TASKS_CACHE['dirty'] = False
+        ACTIVE_TASKS_CACHE['body'] = json.dumps(build_active_tasks())
+    return Response(ACTIVE_TASKS_CACHE['body'], mimetype='application/json')
+
+
+def build_active_tasks():
+    """ Snapshot các task đang chạy/đã dừng cho /api/active-tasks"""
+    return {
         task_id: {
             'task_name': task_data.get('task_name'),
             'group_id': task_data.get('group_id'),
@@ -464,10 +615,10 @@ def get_active_tasks():
             'success': task_data.get('success'),
             'failed': task_data.get('failed'),
         }
-        for task_id, task_data in TASKS.items()
+        # list(): run_task/sweep_finished_tasks thêm/bớt task trên thread request khác
+        for task_id, task_data in list(TASKS.items())
         if task_data.get('status') in ['running', 'stopped']
     }
-    return jsonify(active_tasks)
 
 
 @telegram_bp.route('/api/sessions/delete', methods=['POST'])
@@ -492,9 +643,8 @@ def delete_sessions():
         if active_tasks:
             return jsonify({'error': 'Task is running'}), 409
         
-        conn = get_db_connection()
-        try:
-            group = conn.execute('SELECT folder_path FROM session_groups WHERE id = ?', (group_id,)).fetchone()
+        with db_conn() as conn:
+            group = conn.execute(SQL_GROUP_FOLDER, (group_id,)).fetchone()
             if not group:
                 return jsonify({'error': 'Group not found'}), 404
             
@@ -519,14 +669,13 @@ def delete_sessions():
                     if os.path.isfile(file_path):
                         os.remove(file_path)
                         deleted.append(clean_filename)
-                        
-                        # Remove from metadata
-                        conn.execute('DELETE FROM session_metadata WHERE group_id = ? AND filename = ?',
-                                   (group_id, clean_filename))
                     else:
                         missing.append(clean_filename)
                 except OSError as e:
                     failed.append(clean_filename)
+            
+            # Remove from metadata - một lệnh executemany cho cả danh sách, commit một lần
+            conn.executemany(SQL_DELETE_SESSION_METADATA, [(group_id, filename) for filename in deleted])
             conn.commit()
             
             return jsonify({
@@ -535,8 +684,6 @@ def delete_sessions():
                 'failed': failed
             })
             
-        finally:
-            conn.close()
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -552,30 +699,12 @@ def update_session_info():
         field = data.get('field')
         value = data.get('value')
         
-        if field not in ['full_name', 'username']:
+        upsert_sql = SQL_UPSERT_SESSION_FIELD.get(field)
+        if upsert_sql is None:
             return jsonify({'error': 'Invalid field'}), 400
         
-        conn = get_db_connection()
-        try:
-            # Check if metadata exists
-            existing = conn.execute(
-                'SELECT * FROM session_metadata WHERE group_id = ? AND filename = ?',
-                (group_id, filename)
-            ).fetchone()
-            
-            if existing:
-                # Update
-                conn.execute(
-                    f'UPDATE session_metadata SET {field} = ? WHERE group_id = ? AND filename = ?',
-                    (value, group_id, filename)
-                )
-            else:
-                # Insert
-                conn.execute(
-                    'INSERT INTO session_metadata (group_id, filename, full_name, username) VALUES (?, ?, ?, ?)',
-                    (group_id, filename, value if field == 'full_name' else None, value if field == 'username' else None)
-                )
-            
+        with db_conn() as conn:
+            conn.execute(upsert_sql, (group_id, filename, value))
             conn.commit()
             
             return jsonify({
@@ -584,11 +713,9 @@ def update_session_info():
                 'updated_value': value
             })
             
-        finally:
-            conn.close()
             
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
-print('Telegram routes defined successfully (matched with Main.pyw)')
+logger.debug('Telegram routes defined successfully (matched with Main.pyw)')
@@ -1,4 +1,8 @@
 import os
+import logging
+import logging.handlers
+import queue
+import atexit
 import threading
 import webbrowser
 import time
@@ -18,6 +22,15 @@ PORT = 5000
 BASE_URL = f"http://127.0.0.1:5000"
 APP_NAME = "MonDashboard"
 
+# --- LOGGING ---
+# LOG_LEVEL=DEBUG để bật log debug của các route (mặc định INFO: log debug không được format)
+# Thread request/worker chỉ đẩy record vào queue; một thread listener ghi ra stderr
+LOG_QUEUE = queue.SimpleQueue()
+logging.basicConfig(level=os.environ.get('LOG_LEVEL', 'INFO'), handlers=[logging.handlers.QueueHandler(LOG_QUEUE)])
+log_listener = logging.handlers.QueueListener(LOG_QUEUE, logging.StreamHandler())
+log_listener.start()
+atexit.register(log_listener.stop)  # Ghi nốt log còn trong queue khi thoát
+
 # --- APPLICATION INSTANCE ---
 app = create_app()
 
@@ -93,7 +106,6 @@ def run_server():
         
         # use_reloader=False is CRITICAL for multi-threading stability
         # Set Flask logger to WARNING to reduce spam logs
-        import logging
         log = logging.getLogger('werkzeug')
         log.setLevel(logging.WARNING)
         